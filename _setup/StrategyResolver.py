@@ -1,6 +1,7 @@
 from brownie import interface
 
 from helpers.StrategyCoreResolver import StrategyCoreResolver
+from helpers.reporting import reporter
 from rich.console import Console
 from _setup.config import WANT
 
@@ -30,8 +31,13 @@ class StrategyResolver(StrategyCoreResolver):
 
         return calls
 
+    def get_holder_tokens(self):
+        tokens = super().get_holder_tokens()
+        tokens["auraBal"] = interface.IERC20(self.manager.strategy.AURABAL())
+        return tokens
+
     def confirm_harvest(self, before, after, tx):
-        console.print("=== Compare Harvest ===")
+        reporter.text("=== Compare Harvest ===")
         self.manager.printCompare(before, after)
         self.confirm_harvest_state(before, after, tx)
 
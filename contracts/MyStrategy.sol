@@ -29,6 +29,10 @@ import {IDelegateRegistry} from "../interfaces/snapshot/IDelegateRegistry.sol";
  * - Introduces the bribe redirection fee and processing
  * - Introduces a setter function for the above
  * - Introduces snapshot delegation
+ * Version 1.3:
+ * - Caches Hidden Hand reward tokens and the treasury while claiming bribes
+ * - Claims paying the same token are transferred and reported once per token
+ * - sweepRewards checks protected tokens and resolves the treasury once per call
  */
 
 contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
@@ -184,16 +188,20 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
     /// @notice Will not notify the BRIBES_PROCESSOR as this could be triggered outside bribes
     function sweepRewardToken(address token) external nonReentrant {
         _onlyGovernanceOrStrategist();
-        _sweepRewardToken(token);
+        _sweepRewardToken(token, getProtectedTokens(), address(0));
     }
 
     /// @dev Bulk function for sweepRewardToken
+    /// @notice Protected tokens and the treasury are resolved once for the whole batch
     function sweepRewards(address[] calldata tokens) external nonReentrant {
         _onlyGovernanceOrStrategist();
 
+        address[] memory protectedTokens = getProtectedTokens();
+        address cachedTreasury;
+
         uint256 length = tokens.length;
         for(uint i = 0; i < length; ++i){
-            _sweepRewardToken(tokens[i]);
+            cachedTreasury = _sweepRewardToken(tokens[i], protectedTokens, cachedTreasury);
         }
     }
 
@@ -213,7 +221,7 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
 
     /// @dev Specify the version of the Strategy, for upgrades
     function version() external pure returns (string memory) {
-        return "1.2";
+        return "1.3";
     }
 
     /// @dev Does this function require `tend` to be called?
@@ -383,9 +391,9 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
     /// @dev allows claiming of multiple bribes
     /// @notice Hidden hand only allows to claim all tokens at once, not individually.
     ///         Allows claiming any token as it uses the difference in balance
+    ///         Claims paying the same token are handled as a single transfer
     function claimBribesFromHiddenHand(IRewardDistributor hiddenHandDistributor, IRewardDistributor.Claim[] calldata _claims) external nonReentrant {
         _onlyGovernanceOrStrategist();
-        uint256 numClaims = _claims.length;
 
         uint256 beforeVaultBalance = _getBalance();
         uint256 beforePricePerFullShare = _getPricePerFullShare();
@@ -393,16 +401,12 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
         // Hidden hand uses BRIBE_VAULT address as a substitute for ETH
         address hhBribeVault = hiddenHandDistributor.BRIBE_VAULT();
 
-        // Track token balances before bribes claim
-        uint256[] memory beforeBalance = new uint256[](numClaims);
-        for (uint256 i = 0; i < numClaims; ++i) {
-            (address token, , , ) = hiddenHandDistributor.rewards(_claims[i].identifier);
-            if (token == hhBribeVault) {
-                beforeBalance[i] = address(this).balance;
-            } else {
-                beforeBalance[i] = IERC20Upgradeable(token).balanceOf(address(this));
-            }
-        }
+        // Track token balances before bribes claim, once per distinct token
+        (
+            address[] memory tokens,
+            uint256[] memory beforeBalance,
+            uint256 numTokens
+        ) = _getClaimTokens(hiddenHandDistributor, _claims, hhBribeVault);
 
         // Claim bribes
         isClaimingBribes = true;
@@ -412,8 +416,11 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
         bool nonZeroDiff; // Cached value but also to check if we need to notifyProcessor
         // Ultimately it's proof of non-zero which is good enough
 
-        for (uint256 i = 0; i < numClaims; ++i) {
-            (address token, , , ) = hiddenHandDistributor.rewards(_claims[i].identifier);
+        // Resolved on the first redirection fee, then reused for the other tokens
+        address cachedTreasury;
+
+        for (uint256 i = 0; i < numTokens; ++i) {
+            address token = tokens[i];
 
             if (token == hhBribeVault) {
                 // ETH
@@ -424,7 +431,7 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
                     if (recepient == address(0)) {
                         nonZeroDiff = true;
                     }
-                    _handleRewardTransfer(address(WETH), recepient, difference);
+                    cachedTreasury = _handleRewardTransfer(address(WETH), recepient, difference, cachedTreasury);
                 }
             } else {
                 uint256 difference = IERC20Upgradeable(token).balanceOf(address(this)).sub(beforeBalance[i]);
@@ -433,7 +440,7 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
                     if (recepient == address(0)) {
                         nonZeroDiff = true;
                     }
-                    _handleRewardTransfer(token, recepient, difference);
+                    cachedTreasury = _handleRewardTransfer(token, recepient, difference, cachedTreasury);
                 }
             }
         }
@@ -446,6 +453,41 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
         require(beforePricePerFullShare == _getPricePerFullShare(), "Ppfs can't change");
     }
 
+    /// @dev Distinct reward tokens of the claims, with their balances before claiming
+    /// @notice rewards() is queried once per claim, only the first numTokens entries are set
+    function _getClaimTokens(
+        IRewardDistributor hiddenHandDistributor,
+        IRewardDistributor.Claim[] calldata _claims,
+        address hhBribeVault
+    ) internal view returns (address[] memory tokens, uint256[] memory balances, uint256 numTokens) {
+        uint256 numClaims = _claims.length;
+        tokens = new address[](numClaims);
+        balances = new uint256[](numClaims);
+
+        for (uint256 i = 0; i < numClaims; ++i) {
+            (address token, , , ) = hiddenHandDistributor.rewards(_claims[i].identifier);
+
+            bool seen;
+            for (uint256 j = 0; j < numTokens; ++j) {
+                if (tokens[j] == token) {
+                    seen = true;
+                    break;
+                }
+            }
+            if (seen) {
+                continue;
+            }
+
+            tokens[numTokens] = token;
+            if (token == hhBribeVault) {
+                balances[numTokens] = address(this).balance;
+            } else {
+                balances[numTokens] = IERC20Upgradeable(token).balanceOf(address(this));
+            }
+            ++numTokens;
+        }
+    }
+
     // Example tend is a no-op which returns the values, could also just revert
     function _tend() internal override returns (TokenAmount[] memory tended) {
         revert("no op");
@@ -506,13 +548,20 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
     }
 
     /// *** Handling of rewards ***
-    function _handleRewardTransfer(address token, address recepient, uint256 amount) internal {
+    /// @dev cachedTreasury is address(0) until resolved, returns it so callers can reuse it
+    function _handleRewardTransfer(
+        address token,
+        address recepient,
+        uint256 amount,
+        address cachedTreasury
+    ) internal returns (address) {
         // NOTE: Tokens with an assigned recepient are sent there
         if (recepient != address(0)) {
-            _sendTokenToBriber(token, recepient, amount);
+            return _sendTokenToBriber(token, recepient, amount, cachedTreasury);
         // NOTE: All other tokens are sent to the bribes processor
         } else {
             _sendTokenToBribesProcessor(token, amount);
+            return cachedTreasury;
         }
     }
 
@@ -531,11 +580,19 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
     }
 
     /// @dev Takes a fee on the token and sends remaining to the given briber recepient
-    function _sendTokenToBriber(address token, address recepient, uint256 amount) internal {
+    /// @notice The treasury is only fetched from the vault if cachedTreasury is not set yet
+    function _sendTokenToBriber(
+        address token,
+        address recepient,
+        uint256 amount,
+        address cachedTreasury
+    ) internal returns (address) {
         // Process redirection fee
         uint256 redirectionFee = amount.mul(redirectionFees[token]).div(MAX_BPS);
         if (redirectionFee > 0) {
-            address cachedTreasury = IVault(vault).treasury();
+            if (cachedTreasury == address(0)) {
+                cachedTreasury = IVault(vault).treasury();
+            }
             IERC20Upgradeable(token).safeTransfer(cachedTreasury, redirectionFee);
             emit RedirectionFee(
                 cachedTreasury,
@@ -560,14 +617,25 @@ contract MyStrategy is BaseStrategy, ReentrancyGuardUpgradeable {
                 block.timestamp
             );
         }
+
+        return cachedTreasury;
     }
 
-    function _sweepRewardToken(address token) internal {
-        _onlyNotProtectedTokens(token);
+    /// @dev Same checks as _onlyNotProtectedTokens, against an already built protectedTokens
+    function _sweepRewardToken(
+        address token,
+        address[] memory protectedTokens,
+        address cachedTreasury
+    ) internal returns (address) {
+        require(token != address(0), "Address 0");
+        uint256 numProtected = protectedTokens.length;
+        for (uint256 i = 0; i < numProtected; ++i) {
+            require(protectedTokens[i] != token, "_onlyNotProtectedTokens");
+        }
 
         uint256 toSend = IERC20Upgradeable(token).balanceOf(address(this));
         address recepient = bribesRedirectionPaths[token];
-        _handleRewardTransfer(token, recepient, toSend);
+        return _handleRewardTransfer(token, recepient, toSend, cachedTreasury);
     }
 
     /// PAYABLE FUNCTIONS ///
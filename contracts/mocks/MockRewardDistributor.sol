@@ -14,6 +14,8 @@ contract MockRewardDistributor {
     bytes32 constant private ETH_IDENTIFIER = keccak256("ETH");
 
     mapping(bytes32 => address) public mockRewards;
+    // Lifetime amount claimed per identifier and account, claims carry the lifetime amount
+    mapping(bytes32 => mapping(address => uint256)) public claimed;
 
     function addReward(bytes32 _identifier, address _token) external {
         mockRewards[_identifier] = _token;
@@ -39,12 +41,17 @@ contract MockRewardDistributor {
         for (uint256 i; i < _claims.length; ++i) {
             IRewardDistributor.Claim memory claim = _claims[i];
 
+            uint256 lifetimeClaimed = claimed[claim.identifier][claim.account];
+            require(claim.amount > lifetimeClaimed, "Already claimed");
+            uint256 amount = claim.amount - lifetimeClaimed;
+            claimed[claim.identifier][claim.account] = claim.amount;
+
             if (claim.identifier == ETH_IDENTIFIER) {
-                (bool sent, ) = payable(claim.account).call{value: claim.amount}("");
+                (bool sent, ) = payable(claim.account).call{value: amount}("");
                 require(sent, "Transfer failed");
             } else {
                 IERC20Upgradeable token = IERC20Upgradeable(mockRewards[claim.identifier]);
-                token.safeTransfer(claim.account, claim.amount);
+                token.safeTransfer(claim.account, amount);
             }
         }
     }
@@ -0,0 +1,15 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.12;
+
+import {ERC20Upgradeable} from "@openzeppelin-contracts-upgradeable/token/ERC20/ERC20Upgradeable.sol";
+
+/// @dev Mintable ERC20 used to create many distinct reward tokens in tests
+contract MockToken is ERC20Upgradeable {
+    constructor(string memory _name, string memory _symbol) public {
+        __ERC20_init(_name, _symbol);
+    }
+
+    function mint(address _to, uint256 _amount) external {
+        _mint(_to, _amount);
+    }
+}
@@ -1,18 +1,51 @@
+import asyncio
+from contextlib import contextmanager
+
 from brownie import *
+from eth_utils import to_checksum_address
 from tabulate import tabulate
 from rich.console import Console
-from helpers.multicall import Multicall
+from helpers.multicall import Multicall, func
+from helpers.multicall.async_multicall import AsyncMulticall, AsyncProvider
 from helpers.utils import val
+from helpers.reporting import reporter
 
 from helpers.snapshot.snap import Snap
+from helpers.snapshot.diff import SnapDiff
+from helpers.snapshot.holders import HolderBalances
 
 from _setup.StrategyResolver import StrategyResolver
 
 console = Console()
 
+TRANSFER_TOPIC = web3.keccak(text="Transfer(address,address,uint256)").hex()
+
+
+async def gather_snaps(managers, provider=None, block=None):
+    """
+    Takes a snapshot of each SnapshotManager concurrently
+    All managers share the provider's connection pool
+    """
+    ownProvider = provider is None
+    if ownProvider:
+        provider = AsyncProvider.from_web3()
+
+    async def take(manager):
+        plan = AsyncMulticall.from_multicall(
+            manager.get_plan(manager.entities), provider
+        )
+        data = await plan(block)
+        return manager.record_snap(data, plan.block, manager.entities)
+
+    try:
+        return await asyncio.gather(*[take(manager) for manager in managers])
+    finally:
+        if ownProvider:
+            await provider.close()
+
 
 class SnapshotManager:
-    def __init__(self, sett, strategy, key):
+    def __init__(self, sett, strategy, key, store=None, incremental=False):
         self.key = key
         self.sett = sett
         self.strategy = strategy
@@ -21,6 +54,21 @@ class SnapshotManager:
         self.snaps = {}
         self.settSnaps = {}
         self.entities = {}
+        # Optional SnapStore every snap is appended to
+        self.store = store
+        # After snapshots only re-read the balances touched by the action, see snapIncremental
+        self.incremental = incremental
+        # Set while a session is open, see session()
+        self.sessionOpen = False
+        self.lastSnap = None
+        self.lastTracked = None
+        self.lastHeight = None
+        # Compiled Multicall for the current entity set, see get_plan
+        self.plan = None
+        self.planEntities = None
+        # Compiled Multicall for the tracked holders, see snapHolders
+        self.holderPlan = None
+        self.holderPlanKey = None
 
         assert self.want == self.strategy.want()
 
@@ -43,109 +91,264 @@ class SnapshotManager:
         calls = self.resolver.add_strategy_snap(calls, entities=entities)
         return calls
 
-    def snap(self, trackedUsers=None):
-        print("snap")
-        snapBlock = chain.height
+    def get_plan(self, entities):
+        """
+        Returns the compiled Multicall for the given entities
+        Calls are only rebuilt and re-encoded when the entity set changes
+        """
+        if self.plan is None or self.planEntities != entities:
+            self.plan = Multicall(self.add_snap_calls(entities))
+            self.plan.compile()
+            self.planEntities = dict(entities)
+        return self.plan
+
+    def snap(self, trackedUsers=None, block=None):
+        reporter.text("snap")
         entities = self.entities
 
         if trackedUsers:
-            for key, user in trackedUsers.items():
-                entities[key] = user
+            # Tracked users only live for this snap, they don't become entities
+            entities = dict(self.entities)
+            entities.update(trackedUsers)
 
-        calls = self.add_snap_calls(entities)
-        multi = Multicall(calls)
+        multi = self.get_plan(entities)
         # multi.printCalls()
 
-        data = multi()
+        data = multi(block)
+        # Use the block the aggregate actually ran at, chain.height can move under load
+        return self.record_snap(data, multi.block, entities)
+
+    def record_snap(self, data, snapBlock, entities):
         self.snaps[snapBlock] = Snap(
             data,
             snapBlock,
             [x[0] for x in entities.items()],
         )
+        if self.store is not None:
+            self.store.append(self.snaps[snapBlock])
+        reporter.event("snap", key=self.key, block=snapBlock)
 
         return self.snaps[snapBlock]
 
+    def snap_at(self, block, trackedUsers=None):
+        """
+        Snapshot of a past block, requires a node that keeps historical state
+        """
+        return self.snap(trackedUsers, block)
+
+    def snaps_at(self, blocks, trackedUsers=None):
+        return [self.snap_at(block, trackedUsers) for block in blocks]
+
+    def snapHolders(self, holders, block=None):
+        """
+        Balances of every holder for the tokens returned by resolver.get_holder_tokens
+        Meant for thousands of addresses, calls are chunked and the plan is reused
+        """
+        holders = list(holders)
+        tokens = self.resolver.get_holder_tokens()
+        planKey = (tuple(holders), tuple(tokens.keys()))
+        if self.holderPlan is None or self.holderPlanKey != planKey:
+            calls = []
+            for tokenKey, token in tokens.items():
+                calls = self.resolver.add_holder_balances(
+                    calls, tokenKey, token, holders
+                )
+            self.holderPlan = Multicall(calls)
+            self.holderPlan.compile()
+            self.holderPlanKey = planKey
+
+        data = self.holderPlan(block)
+        balances = HolderBalances(holders, tokens.keys(), self.holderPlan.block)
+        for (tokenKey, i), value in data.items():
+            balances.columns[tokenKey][i] = value
+        return balances
+
+    @contextmanager
+    def session(self):
+        """
+        Within a session the after snapshot of an action is reused as the
+        before snapshot of the next one, as long as no block was mined in between
+        """
+        self.sessionOpen = True
+        try:
+            yield self
+        finally:
+            self.sessionOpen = False
+            self.lastSnap = None
+
+    def snapBefore(self, trackedUsers):
+        if (
+            self.sessionOpen
+            and self.lastSnap is not None
+            and self.lastTracked == trackedUsers
+            and self.lastHeight == chain.height
+        ):
+            return self.lastSnap
+        return self.snap(trackedUsers)
+
+    def touchedBalances(self, tx):
+        """
+        (token, account) pairs whose balance may have changed in tx
+        Read from the Transfer logs, plus Harvested / RewardsCollected for the strategy
+        """
+        touched = set()
+        for log in tx.logs:
+            topics = log["topics"]
+            if len(topics) == 3 and topics[0].hex() == TRANSFER_TOPIC:
+                token = log["address"]
+                touched.add((token, to_checksum_address(topics[1][-20:])))
+                touched.add((token, to_checksum_address(topics[2][-20:])))
+
+        for name in ["Harvested", "RewardsCollected"]:
+            if name in tx.events:
+                for event in tx.events[name]:
+                    touched.add((event["token"], self.strategy.address))
+                    touched.add((event["token"], self.sett.address))
+        return touched
+
+    def snapIncremental(self, previous, tx, trackedUsers=None):
+        """
+        Re-reads the balances touched by tx and every non balance metric
+        Untouched balances are carried over from previous, copy on write
+        """
+        entities = self.entities
+        if trackedUsers:
+            entities = dict(self.entities)
+            entities.update(trackedUsers)
+        if previous.entityKeys != list(entities.keys()):
+            return self.snap(trackedUsers)
+
+        touched = self.touchedBalances(tx)
+        calls = [
+            call
+            for call in self.get_plan(entities).calls
+            if call.function != func.erc20.balanceOf
+            or (call.target, to_checksum_address(call.args[0])) in touched
+        ]
+        multi = Multicall(calls)
+        data = multi()
+
+        reporter.text("snap (incremental)")
+        snap = previous.fork(multi.block, previous.entityKeys)
+        for key, value in data.items():
+            snap.set(key, value)
+        self.snaps[snap.block] = snap
+        if self.store is not None:
+            self.store.append(snap)
+        reporter.event(
+            "snap", key=self.key, block=snap.block, incremental=True, calls=len(calls)
+        )
+        return snap
+
+    def snapAfter(self, trackedUsers, before=None, tx=None):
+        if self.incremental and before is not None and tx is not None:
+            after = self.snapIncremental(before, tx, trackedUsers)
+        else:
+            after = self.snap(trackedUsers)
+        if self.sessionOpen:
+            self.lastSnap = after
+            self.lastTracked = dict(trackedUsers)
+            self.lastHeight = chain.height
+        return after
+
     def addEntity(self, key, entity):
         self.entities[key] = entity
+        self.plan = None
 
     def init_resolver(self, name):
-        print("init_resolver", name)
+        reporter.text("init_resolver {}".format(name))
         return StrategyResolver(self)
 
     def settTend(self, overrides, confirm=True):
         user = overrides["from"].address
         trackedUsers = {"user": user}
-        before = self.snap(trackedUsers)
+        before = self.snapBefore(trackedUsers)
         tx = self.strategy.tend(overrides)
-        after = self.snap(trackedUsers)
+        after = self.snapAfter(trackedUsers, before, tx)
         if confirm:
-            self.resolver.confirm_tend(before, after, tx)
+            with reporter.on_failure():
+                self.resolver.confirm_tend(before, after, tx)
 
-    def settHarvest(self, overrides, confirm=True):
+    def settHarvest(self, overrides, confirm=True, holders=None):
+        """
+        If holders are given, every one of them is audited across the harvest
+        """
         user = overrides["from"].address
         trackedUsers = {"user": user}
-        before = self.snap(trackedUsers)
+        before = self.snapBefore(trackedUsers)
+        holdersBefore = self.snapHolders(holders, before.block) if holders else None
         tx = self.strategy.harvest(overrides)
-        after = self.snap(trackedUsers)
+        after = self.snapAfter(trackedUsers, before, tx)
+        holdersAfter = self.snapHolders(holders, after.block) if holders else None
         if confirm:
-            self.resolver.confirm_harvest(before, after, tx)
+            with reporter.on_failure():
+                self.resolver.confirm_harvest(before, after, tx)
+                if holders:
+                    self.resolver.confirm_holders(
+                        before, after, holdersBefore, holdersAfter
+                    )
 
     def settDeposit(self, amount, overrides, confirm=True):
         user = overrides["from"].address
         trackedUsers = {"user": user}
-        before = self.snap(trackedUsers)
-        self.sett.deposit(amount, overrides)
-        after = self.snap(trackedUsers)
+        before = self.snapBefore(trackedUsers)
+        tx = self.sett.deposit(amount, overrides)
+        after = self.snapAfter(trackedUsers, before, tx)
 
         if confirm:
-            self.resolver.confirm_deposit(
-                before, after, {"user": user, "amount": amount}
-            )
+            with reporter.on_failure():
+                self.resolver.confirm_deposit(
+                    before, after, {"user": user, "amount": amount}
+                )
 
     def settDepositAll(self, overrides, confirm=True):
         user = overrides["from"].address
         trackedUsers = {"user": user}
         userBalance = self.want.balanceOf(user)
-        before = self.snap(trackedUsers)
-        self.sett.depositAll(overrides)
-        after = self.snap(trackedUsers)
+        before = self.snapBefore(trackedUsers)
+        tx = self.sett.depositAll(overrides)
+        after = self.snapAfter(trackedUsers, before, tx)
         if confirm:
-            self.resolver.confirm_deposit(
-                before, after, {"user": user, "amount": userBalance}
-            )
+            with reporter.on_failure():
+                self.resolver.confirm_deposit(
+                    before, after, {"user": user, "amount": userBalance}
+                )
 
     def settEarn(self, overrides, confirm=True):
         user = overrides["from"].address
         trackedUsers = {"user": user}
-        before = self.snap(trackedUsers)
-        self.sett.earn(overrides)
-        after = self.snap(trackedUsers)
+        before = self.snapBefore(trackedUsers)
+        tx = self.sett.earn(overrides)
+        after = self.snapAfter(trackedUsers, before, tx)
         if confirm:
-            self.resolver.confirm_earn(before, after, {"user": user})
+            with reporter.on_failure():
+                self.resolver.confirm_earn(before, after, {"user": user})
 
     def settWithdraw(self, amount, overrides, confirm=True):
         user = overrides["from"].address
         trackedUsers = {"user": user}
-        before = self.snap(trackedUsers)
+        before = self.snapBefore(trackedUsers)
         tx = self.sett.withdraw(amount, overrides)
-        after = self.snap(trackedUsers)
+        after = self.snapAfter(trackedUsers, before, tx)
         if confirm:
-            self.resolver.confirm_withdraw(
-                before, after, {"user": user, "amount": amount}, tx
-            )
+            with reporter.on_failure():
+                self.resolver.confirm_withdraw(
+                    before, after, {"user": user, "amount": amount}, tx
+                )
 
     def settWithdrawAll(self, overrides, confirm=True):
         user = overrides["from"].address
         trackedUsers = {"user": user}
         userBalance = self.sett.balanceOf(user)
-        before = self.snap(trackedUsers)
+        before = self.snapBefore(trackedUsers)
         tx = self.sett.withdraw(userBalance, overrides)
-        after = self.snap(trackedUsers)
+        after = self.snapAfter(trackedUsers, before, tx)
 
         if confirm:
-            self.resolver.confirm_withdraw(
-                before, after, {"user": user, "amount": userBalance}, tx
-            )
+            with reporter.on_failure():
+                self.resolver.confirm_withdraw(
+                    before, after, {"user": user, "amount": userBalance}, tx
+                )
 
     def format(self, key, value):
         if type(value) is int:
@@ -168,36 +371,28 @@ class SnapshotManager:
         else:
             return "-"
 
+    def compare(self, before: Snap, after: Snap):
+        return SnapDiff(before, after)
+
     def printCompare(self, before: Snap, after: Snap):
         # self.printPermissions()
-        table = []
-        console.print(
+        reporter.text(
             "[green]=== Compare: {} Sett {} -> {} ===[/green]".format(
                 self.key, before.block, after.block
             )
         )
 
-        for key, item in before.data.items():
-
-            a = item
-            b = after.get(key)
-
-            # Don't add items that don't change
-            if a != b:
-                table.append(
-                    [
-                        key,
-                        self.format(key, a),
-                        self.format(key, b),
-                        self.format(key, self.diff(a, b)),
-                    ]
-                )
-
-        print(
-            tabulate(
-                table, headers=["metric", "before", "after", "diff"], tablefmt="grid"
-            )
+        diff = self.compare(before, after)
+        # Items that don't change are left out
+        reporter.table(lambda: diff.render(self.format))
+        reporter.event(
+            "compare",
+            key=self.key,
+            before=before.block,
+            after=after.block,
+            changed=lambda: {key: d for key, a, b, d in diff.rows()},
         )
+        return diff
 
     def printPermissions(self):
         # Accounts
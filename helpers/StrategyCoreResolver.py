@@ -12,6 +12,7 @@ from helpers.utils import (
 )
 from helpers.constants import *
 from helpers.multicall import Call, as_wei, func
+from helpers.reporting import reporter
 from rich.console import Console
 
 console = Console()
@@ -47,6 +48,25 @@ class StrategyCoreResolver:
 
         return calls
 
+    def add_holder_balances(self, calls, tokenKey, token, holders):
+        # Keyed by (tokenKey, index) so results land straight in HolderBalances columns
+        for i, holder in enumerate(holders):
+            calls.append(
+                Call(
+                    token.address,
+                    [func.erc20.balanceOf, holder],
+                    [[(tokenKey, i), as_wei]],
+                )
+            )
+
+        return calls
+
+    def get_holder_tokens(self):
+        """
+        Tokens tracked for every holder by SnapshotManager.snapHolders
+        """
+        return {"want": self.manager.want, "sett": self.manager.sett}
+
     def add_balances_snap(self, calls, entities):
         want = self.manager.want
         sett = self.manager.sett
@@ -165,7 +185,7 @@ class StrategyCoreResolver:
         - Users balanceOf() want should not change
         """
 
-        console.print("=== Compare Earn ===")
+        reporter.text("=== Compare Earn ===")
         self.manager.printCompare(before, after)
 
         # Do nothing if there is not enough available want in sett to transfer.
@@ -201,7 +221,7 @@ class StrategyCoreResolver:
         - Decrease the available() if it is not zero
         """
 
-        console.print("=== Compare Withdraw ===")
+        reporter.text("=== Compare Withdraw ===")
         self.manager.printCompare(before, after)
 
         if params["amount"] == 0:
@@ -328,7 +348,7 @@ class StrategyCoreResolver:
         """
 
         ppfs = before.get("sett.getPricePerFullShare")
-        console.print("=== Compare Deposit ===")
+        reporter.text("=== Compare Deposit ===")
         self.manager.printCompare(before, after)
 
         expected_shares = Decimal(params["amount"] * Wei("1 ether")) / Decimal(ppfs)
@@ -446,18 +466,31 @@ class StrategyCoreResolver:
         shares_management = fees.shares_management
         shares_perf_strategist = fees.shares_perf_strategist
 
-        delta_strategist = after.balances("sett", "strategist") - before.balances(
-            "sett", "strategist"
-        )
+        diff = self.manager.compare(before, after)
+
+        delta_strategist = diff.delta("balances.sett.strategist")
 
         assert delta_strategist == shares_perf_strategist
 
-        delta_treasury = after.balances("sett", "treasury") - before.balances(
-            "sett", "treasury"
-        )
+        delta_treasury = diff.delta("balances.sett.treasury")
 
         assert delta_treasury == shares_perf_treasury + shares_management
 
+    def confirm_holders(self, before, after, holdersBefore, holdersAfter):
+        """
+        Holders Should (across a harvest);
+        - Keep their sett balance, fee shares only go to the treasury and strategist
+        - Keep their want balance
+        - Never own more shares in total than the supply
+        """
+        feeRecipients = {
+            self.manager.entities["treasury"],
+            self.manager.entities["strategist"],
+        }
+        assert set(holdersBefore.changed(holdersAfter, "sett")) <= feeRecipients
+        assert holdersBefore.changed(holdersAfter, "want") == []
+        assert holdersAfter.total("sett") <= after.get("sett.totalSupply")
+
     def confirm_tend(self, before, after, tx):
         """
         Tend Should;
@@ -1,3 +1,7 @@
 AddressZero = "0x0000000000000000000000000000000000000000"
 MaxUint256 = str(int(2**256 - 1))
 EmptyBytes32 = "0x0000000000000000000000000000000000000000000000000000000000000000"
+
+# AuraLocker epochs are a week, lockDuration is 17 weeks from the current epoch
+WEEK = 7 * 86400
+LOCK_DURATION = 17 * WEEK
@@ -0,0 +1,75 @@
+import json
+import os
+
+"""
+  Gas used per benchmarked call, compared against a JSON baseline
+  GAS_REGRESSION_BPS: allowed increase over the baseline, in bps (default 5%)
+  UPDATE_GAS_BASELINE=1: write the measured values to the baseline instead of failing
+  A path missing from the baseline is only measured, see missing()
+"""
+
+GAS_REGRESSION_BPS = 500
+MAX_BPS = 10_000
+
+
+class GasBaseline:
+    def __init__(self, path, threshold_bps=None, update=None):
+        self.path = path
+        if threshold_bps is None:
+            threshold_bps = int(
+                os.environ.get("GAS_REGRESSION_BPS", GAS_REGRESSION_BPS)
+            )
+        if update is None:
+            update = os.environ.get("UPDATE_GAS_BASELINE", "") not in ["", "0"]
+        self.threshold_bps = threshold_bps
+        self.update = update
+        self.baseline = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.baseline = json.load(f)
+        self.measured = {}
+
+    def missing(self, name):
+        """
+        True when name has no baseline to compare against and isn't being recorded
+        """
+        return not self.update and name not in self.baseline
+
+    def limit(self, name):
+        if name not in self.baseline:
+            return None
+        return self.baseline[name] * (MAX_BPS + self.threshold_bps) // MAX_BPS
+
+    def record(self, name, gas):
+        """
+        Returns an error message if gas regressed past the threshold, None otherwise
+        """
+        self.measured[name] = gas
+        limit = self.limit(name)
+        if self.update or limit is None or gas <= limit:
+            return None
+        return "{} used {} gas, baseline {} (+{} bps allowed)".format(
+            name, gas, self.baseline[name], self.threshold_bps
+        )
+
+    def report(self):
+        """
+        [(name, baseline, measured, deltaBps)] of the measured paths
+        baseline and deltaBps are None for paths missing from the baseline
+        """
+        rows = []
+        for name in sorted(self.measured):
+            gas = self.measured[name]
+            baseline = self.baseline.get(name)
+            delta = None
+            if baseline:
+                delta = (gas - baseline) * MAX_BPS // baseline
+            rows.append((name, baseline, gas, delta))
+        return rows
+
+    def save(self):
+        baseline = dict(self.baseline)
+        baseline.update(self.measured)
+        with open(self.path, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
@@ -0,0 +1,172 @@
+from brownie import web3
+from dotmap import DotMap
+from eth_abi import encode_abi
+from hexbytes import HexBytes
+
+from helpers.multicall import Call, Multicall, func
+from helpers.shares_math import MAX_BPS
+
+"""
+  Quotes MyStrategy._harvest's route off-chain:
+  auraBAL -> BAL/ETH BPT (swap) -> WETH (single token exit) -> AURA (swap)
+  Every leg is an eth_call pinned to the same block, results are cached for that block
+"""
+
+# Not referenced by the strategy, queryExit lives on Balancer's helper contract
+BALANCER_HELPERS = "0x5aDDCCa35b7A0D07C74063c48700C8590E87864E"
+
+# Same as MyStrategy.BPT_WETH_INDEX and ExitKind.EXACT_BPT_IN_FOR_ONE_TOKEN_OUT
+BPT_WETH_INDEX = 1
+EXACT_BPT_IN_FOR_ONE_TOKEN_OUT = 0
+GIVEN_IN = 0
+
+# Room left under the quoted BPT out for the blocks until the harvest lands
+DEFAULT_SLIPPAGE_BPS = 50
+
+QUERY_BATCH_SWAP = (
+    "queryBatchSwap(uint8,(bytes32,uint256,uint256,uint256,bytes)[],address[],"
+    "(address,bool,address,bool))(int256[])"
+)
+QUERY_EXIT = (
+    "queryExit(bytes32,address,address,(address[],uint256[],bytes,bool))"
+    "(uint256,uint256[])"
+)
+CLAIMABLE_REWARDS = "claimableRewards(address)((address,uint256)[])"
+
+
+class HarvestQuoter:
+    def __init__(self, strategy, slippage_bps=DEFAULT_SLIPPAGE_BPS):
+        self.strategy = strategy
+        self.slippage_bps = slippage_bps
+        # Every route address comes from the strategy, so quotes follow the contract
+        self.balancerVault = strategy.BALANCER_VAULT()
+        self.locker = strategy.LOCKER()
+        self.bal = strategy.BAL()
+        self.weth = strategy.WETH()
+        self.auraBal = strategy.AURABAL()
+        self.bpt = strategy.BALETH_BPT()
+        self.aura = strategy.AURA()
+        self.auraBalPoolId = HexBytes(strategy.AURABAL_BALETH_BPT_POOL_ID())
+        self.balEthPoolId = HexBytes(strategy.BAL_ETH_POOL_ID())
+        self.auraEthPoolId = HexBytes(strategy.AURA_ETH_POOL_ID())
+        self.funds = [strategy.address, False, strategy.address, False]
+        # Quotes of the current block, keyed by auraBAL in
+        self.cacheBlock = None
+        self.cache = {}
+        self.cachePending = None
+
+    # ===== Legs =====
+
+    def swap(self, poolId, assetIn, assetOut, amount, block):
+        call = Call(
+            self.balancerVault,
+            [
+                QUERY_BATCH_SWAP,
+                GIVEN_IN,
+                [[poolId, 0, 1, amount, b""]],
+                [assetIn, assetOut],
+                self.funds,
+            ],
+        )
+        deltas = call(block_identifier=block)
+        # Vault deltas are negative for what it sends out
+        return -deltas[1]
+
+    def exit(self, bptIn, block):
+        userData = encode_abi(
+            ["uint256", "uint256", "uint256"],
+            [EXACT_BPT_IN_FOR_ONE_TOKEN_OUT, bptIn, BPT_WETH_INDEX],
+        )
+        call = Call(
+            BALANCER_HELPERS,
+            [
+                QUERY_EXIT,
+                self.balEthPoolId,
+                self.strategy.address,
+                self.strategy.address,
+                [[self.bal, self.weth], [0, 0], userData, False],
+            ],
+        )
+        bptIn, amountsOut = call(block_identifier=block)
+        return amountsOut[BPT_WETH_INDEX]
+
+    # ===== Quotes =====
+
+    def pending(self, block=None):
+        """
+        auraBAL the next harvest swaps, claimable from the locker plus the strategy's
+        """
+        multi = Multicall(
+            [
+                Call(
+                    self.locker,
+                    [CLAIMABLE_REWARDS, self.strategy.address],
+                    [["earned", None]],
+                ),
+                Call(
+                    self.auraBal,
+                    [func.erc20.balanceOf, self.strategy.address],
+                    [["balance", None]],
+                ),
+            ],
+            block_identifier=block,
+        )
+        data = multi()
+        earned = sum(
+            amount
+            for token, amount in data["earned"]
+            if token.lower() == self.auraBal.lower()
+        )
+        return earned + data["balance"]
+
+    def quote(self, amount=None, block=None):
+        """
+        Expected output of each leg for amount auraBAL (defaults to pending) at block
+        """
+        if block is None:
+            block = web3.eth.blockNumber
+        if block != self.cacheBlock:
+            self.cacheBlock = block
+            self.cache = {}
+            self.cachePending = None
+        if amount is None:
+            if self.cachePending is None:
+                self.cachePending = self.pending(block)
+            amount = self.cachePending
+        if amount in self.cache:
+            return self.cache[amount]
+
+        quote = DotMap(
+            block=block, auraBal=amount, bpt=0, weth=0, aura=0, minOutBps=None
+        )
+        if amount > 0:
+            quote.bpt = self.swap(
+                self.auraBalPoolId, self.auraBal, self.bpt, amount, block
+            )
+            quote.weth = self.exit(quote.bpt, block)
+            quote.aura = self.swap(
+                self.auraEthPoolId, self.weth, self.aura, quote.weth, block
+            )
+            quote.minOutBps = self.min_out_bps(amount, quote.bpt)
+        self.cache[amount] = quote
+        return quote
+
+    def min_out_bps(self, auraBalIn, bptOut):
+        """
+        auraBalToBalEthBptMinOutBps for the quoted rate, less slippage_bps
+        """
+        bps = bptOut * (MAX_BPS - self.slippage_bps) // auraBalIn
+        return min(bps, MAX_BPS)
+
+    def push(self, account, block=None):
+        """
+        Sets the recommended minOut on the strategy, returns the tx or None if unchanged
+        """
+        quote = self.quote(block=block)
+        if quote.minOutBps is None:
+            return None
+        if quote.minOutBps == self.strategy.auraBalToBalEthBptMinOutBps():
+            return None
+        return self.strategy.setAuraBalToBalEthBptMinOutBps(
+            quote.minOutBps, {"from": account}
+        )
@@ -0,0 +1,110 @@
+import json
+
+from dotmap import DotMap
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+
+from helpers.multicall import Call, Multicall, func
+
+"""
+  Plans MyStrategy.claimBribesFromHiddenHand transactions from a Hidden Hand distribution
+  Claims already paid out are dropped, the rest is packed into batches under a gas budget
+  so a single bad claim can't revert the whole batch
+"""
+
+# Gas per claimBribesFromHiddenHand transaction, well under the block limit
+CLAIM_GAS_BUDGET = 5_000_000
+
+
+def to_claim(entry):
+    """
+    (identifier, account, amount, merkleProof) from a distribution entry
+    Accepts the Hidden Hand API format ({"claimMetadata": {...}}) or the metadata itself
+    """
+    metadata = entry.get("claimMetadata", entry)
+    return (
+        HexBytes(metadata["identifier"]),
+        to_checksum_address(metadata["account"]),
+        int(metadata["amount"]),
+        [HexBytes(proof) for proof in metadata["merkleProof"]],
+    )
+
+
+def load_claims(path, account=None):
+    """
+    Claims of account in a distribution file, either a list of entries or {"data": [...]}
+    """
+    with open(path) as f:
+        distribution = json.load(f)
+    if isinstance(distribution, dict):
+        distribution = distribution["data"]
+    claims = [to_claim(entry) for entry in distribution]
+    if account is not None:
+        account = to_checksum_address(str(account))
+        claims = [claim for claim in claims if claim[1] == account]
+    return claims
+
+
+def filter_unclaimed(distributor, claims, block=None):
+    """
+    Claims whose lifetime amount is above what the distributor already paid
+    One multicall for every claimed(identifier, account) lookup
+    """
+    if not claims:
+        return []
+    multi = Multicall(
+        [
+            Call(
+                str(distributor),
+                [func.hiddenHand.claimed, identifier, account],
+                [[i, None]],
+            )
+            for i, (identifier, account, amount, proof) in enumerate(claims)
+        ],
+        block_identifier=block,
+    )
+    claimed = multi()
+    return [claim for i, claim in enumerate(claims) if claim[2] > claimed[i]]
+
+
+def estimate(strategy, distributor, claims, sender):
+    """
+    Gas of claiming claims in one transaction, None if it reverts
+    """
+    try:
+        return strategy.claimBribesFromHiddenHand.estimate_gas(
+            distributor, claims, {"from": sender}
+        )
+    except Exception:
+        return None
+
+
+def plan_claims(strategy, distributor, claims, sender, gas_budget=CLAIM_GAS_BUDGET):
+    """
+    Packs the unclaimed claims into batches that fit gas_budget
+    Returns DotMap(batches=[DotMap(claims, gas)], failing=[claim]), failing claims revert alone
+    """
+    batches = []
+    failing = []
+    batch = []
+    batchGas = 0
+    for claim in filter_unclaimed(distributor, claims):
+        gas = estimate(strategy, distributor, batch + [claim], sender)
+        if gas is not None and gas <= gas_budget:
+            batch.append(claim)
+            batchGas = gas
+            continue
+
+        # Either the batch is full or this claim reverts, tell them apart on its own
+        alone = estimate(strategy, distributor, [claim], sender)
+        if alone is None or alone > gas_budget:
+            failing.append(claim)
+            continue
+        if batch:
+            batches.append(DotMap(claims=batch, gas=batchGas))
+        batch = [claim]
+        batchGas = alone
+
+    if batch:
+        batches.append(DotMap(claims=batch, gas=batchGas))
+    return DotMap(batches=batches, failing=failing)
@@ -0,0 +1,183 @@
+import asyncio
+
+from brownie import web3
+from rich.console import Console
+
+from helpers.constants import WEEK
+from helpers.lock_ladder import LockLadder
+from helpers.multicall import Call, Multicall, func
+from helpers.multicall.async_multicall import AsyncMulticall, AsyncProvider
+
+"""
+  Off-chain replacement for the Chainlink keepers of MyStrategy
+  One pooled checkUpkeep multicall per tick for every strategy, then
+  sleeps until the next lock of any strategy expires
+"""
+
+console = Console()
+
+# Lower bound between two ticks, so a failing upkeep doesn't spin
+MIN_SLEEP = 15
+# Upper bound, locks made since the last tick are picked up at least this often
+MAX_SLEEP = WEEK
+PERFORM_UPKEEP = "performUpkeep"
+MANUAL_PROCESS = "manualProcessExpiredLocks"
+
+
+class Keeper:
+    def __init__(
+        self,
+        strategies,
+        account,
+        provider=None,
+        method=PERFORM_UPKEEP,
+        min_sleep=MIN_SLEEP,
+        max_sleep=MAX_SLEEP,
+    ):
+        assert method in [PERFORM_UPKEEP, MANUAL_PROCESS], "Unknown method"
+        self.strategies = list(strategies)
+        self.account = account
+        self.provider = provider
+        self.method = method
+        self.min_sleep = min_sleep
+        self.max_sleep = max_sleep
+        self.ladders = {
+            strategy.address: LockLadder(strategy.LOCKER(), strategy.address)
+            for strategy in self.strategies
+        }
+        # Next nonce to use, read from the chain on the first send and after errors
+        self.nonce = None
+        # Block the last check ran at
+        self.block = None
+        # Compiled once, every tick reuses the encoded calldata
+        self.plan = Multicall(
+            [
+                Call(
+                    strategy.address,
+                    [func.strategy.checkUpkeep, b""],
+                    [[strategy.address, None], [(strategy.address, "data"), None]],
+                    default=False,
+                )
+                for strategy in self.strategies
+            ],
+            allow_failure=True,
+        )
+        self.plan.compile()
+
+    # ===== Checks =====
+
+    async def check(self, block=None):
+        """
+        Strategies whose checkUpkeep returns true at block
+        A reverting checkUpkeep (e.g. a paused strategy) counts as false
+        """
+        if self.provider is None:
+            self.provider = AsyncProvider.from_web3()
+        multi = AsyncMulticall.from_multicall(self.plan, self.provider)
+        data = await multi(block)
+        self.block = multi.block
+        return [strategy for strategy in self.strategies if data[strategy.address]]
+
+    def next_unlock(self, timestamp):
+        unlocks = [
+            ladder.next_unlock(timestamp)
+            for ladder in self.ladders.values()
+            if ladder.next_unlock(timestamp) is not None
+        ]
+        return min(unlocks) if unlocks else None
+
+    def sleep_for(self, timestamp):
+        """
+        Seconds until the next unlock, within min_sleep and max_sleep
+        Expired locks still in the ladder mean the last upkeep didn't land, retry soon
+        """
+        if any(ladder.withdrawable_at(timestamp) for ladder in self.ladders.values()):
+            return self.min_sleep
+        unlock = self.next_unlock(timestamp)
+        if unlock is None:
+            return self.max_sleep
+        return min(max(unlock - timestamp, self.min_sleep), self.max_sleep)
+
+    # ===== Transactions =====
+
+    def next_nonce(self):
+        if self.nonce is None:
+            self.nonce = web3.eth.getTransactionCount(self.account.address, "pending")
+        nonce = self.nonce
+        self.nonce += 1
+        return nonce
+
+    def perform(self, strategy):
+        """
+        Sends the upkeep without waiting for it to be mined
+        Nonces are assigned locally so several upkeeps can be sent in one tick
+        """
+        params = {
+            "from": self.account,
+            "nonce": self.next_nonce(),
+            "required_confs": 0,
+        }
+        try:
+            if self.method == PERFORM_UPKEEP:
+                return strategy.performUpkeep(b"", params)
+            return strategy.manualProcessExpiredLocks(params)
+        except Exception as e:
+            # Nonce is stale (e.g. the account sent a tx elsewhere) or the tx failed
+            self.nonce = None
+            console.print(
+                "[red]Upkeep of {} failed: {}[/red]".format(strategy.address, e)
+            )
+            return None
+
+    # ===== Loop =====
+
+    def perform_all(self, strategies):
+        # One at a time, the nonces are assigned in order
+        return [tx for tx in [self.perform(strategy) for strategy in strategies] if tx]
+
+    def sync_ladders(self, block):
+        for ladder in self.ladders.values():
+            ladder.sync(block)
+
+    async def latest_block(self):
+        block = await self.provider.request("eth_getBlockByNumber", ["latest", False])
+        return int(block["number"], 16), int(block["timestamp"], 16)
+
+    async def tick(self):
+        """
+        Runs one round: check every strategy, send the upkeeps, refresh the ladders
+        Returns the sent transactions and the seconds to sleep until the next round
+        Brownie sends and the ladders' getLogs block, they run in the default executor
+        """
+        loop = asyncio.get_running_loop()
+        due = await self.check()
+        txs = await loop.run_in_executor(None, self.perform_all, due)
+
+        # Upkeeps mined after this block are replayed by the next sync
+        number, timestamp = await self.latest_block()
+        await loop.run_in_executor(None, self.sync_ladders, number)
+        return txs, self.sleep_for(timestamp)
+
+    async def close(self):
+        if self.provider is not None:
+            await self.provider.close()
+
+    async def run(self, stop=None):
+        """
+        Runs until stop (an asyncio.Event) is set
+        """
+        stop = stop or asyncio.Event()
+        try:
+            while not stop.is_set():
+                txs, delay = await self.tick()
+                console.print(
+                    "Upkeep sent for {} strategies, next check in {}s".format(
+                        len(txs), delay
+                    )
+                )
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.close()
@@ -0,0 +1,145 @@
+from bisect import bisect_left
+
+from brownie import web3
+from dotmap import DotMap
+
+from helpers.constants import WEEK, LOCK_DURATION
+from helpers.lock_ladder import LockLadder
+from helpers.multicall import Call, Multicall, func
+from helpers.shares_math import MAX_BPS
+
+"""
+  Week by week forecast of the want the vault can pay out
+  Liquidity is the vault's idle want, the strategy's balanceOfWant and
+  the vlAURA locks expired by then, which processExpiredLocks releases on withdraw
+"""
+
+# MyStrategy._withdrawSome: require(max >= _amount.mul(9_980).div(MAX_BPS))
+WITHDRAWAL_SAFETY_BPS = 9_980
+# One point per epoch until every current lock has expired
+FORECAST_WEEKS = LOCK_DURATION // WEEK + 1
+
+
+class LiquidityForecaster:
+    def __init__(self, vault, strategy, ladder=None, weeks=FORECAST_WEEKS):
+        self.vault = vault
+        self.strategy = strategy
+        self.want = strategy.want()
+        # An unloaded ladder has len 0, test for None so a shared one is kept
+        self.ladder = (
+            ladder
+            if ladder is not None
+            else LockLadder(strategy.LOCKER(), strategy.address)
+        )
+        self.weeks = weeks
+        self.block = None
+        self.timestamp = None
+        self.vaultWant = 0
+        self.strategyWant = 0
+        # [(timestamp, redeemable)], rebuilt by update
+        self.points = []
+
+    # ===== Updates =====
+
+    def update(self, block=None):
+        """
+        Refreshes the balances and replays lock events since the last update
+        Cheap enough to run every block: one multicall, one getLogs
+        """
+        multi = Multicall(
+            [
+                Call(
+                    self.want,
+                    [func.erc20.balanceOf, self.vault.address],
+                    [["vault", None]],
+                ),
+                Call(
+                    self.strategy.address,
+                    func.strategy.balanceOfWant,
+                    [["strategy", None]],
+                ),
+            ],
+            block_identifier=block,
+        )
+        data = multi()
+        self.block = multi.block
+        self.timestamp = web3.eth.getBlock(self.block)["timestamp"]
+        self.vaultWant = data["vault"]
+        self.strategyWant = data["strategy"]
+        self.ladder.sync(self.block)
+
+        epoch = self.timestamp // WEEK * WEEK
+        self.points = [(self.timestamp, self.redeemable_at(self.timestamp))]
+        for week in range(1, self.weeks + 1):
+            timestamp = epoch + week * WEEK
+            self.points.append((timestamp, self.redeemable_at(timestamp)))
+        return self
+
+    # ===== Views =====
+
+    def liquid(self):
+        return self.vaultWant + self.strategyWant
+
+    def redeemable_at(self, timestamp):
+        return self.liquid() + self.ladder.withdrawable_at(timestamp)
+
+    def max_withdrawal_at(self, timestamp):
+        """
+        Largest want request that passes the Withdrawal Safety Check at timestamp
+        The vault pays its idle want, the safety check applies to the strategy's part
+        """
+        fromStrategy = self.strategyWant + self.ladder.withdrawable_at(timestamp)
+        return self.vaultWant + fromStrategy * MAX_BPS // WITHDRAWAL_SAFETY_BPS
+
+    def curve(self):
+        return self.points
+
+    def summary(self):
+        """
+        Serializable view for a dashboard
+        """
+        return DotMap(
+            block=self.block,
+            timestamp=self.timestamp,
+            vaultWant=self.vaultWant,
+            strategyWant=self.strategyWant,
+            locked=self.ladder.locked(),
+            curve=[
+                {"timestamp": timestamp, "redeemable": redeemable}
+                for timestamp, redeemable in self.points
+            ],
+        )
+
+    # ===== Queue =====
+
+    def time_to_fill(self, target):
+        """
+        Earliest time liquidity reaches target, None if the current locks never cover it
+        """
+        if target <= self.liquid():
+            return self.timestamp
+        ladder = self.ladder
+        needed = target - self.liquid() + ladder.base()
+        i = bisect_left(ladder.cumulative, needed, ladder.head)
+        if i == len(ladder.cumulative):
+            return None
+        return max(ladder.unlockTimes[i], self.timestamp)
+
+    def simulate(self, requests):
+        """
+        Serves requests [(timestamp, amount)] first come first served
+        Returns [(timestamp, amount, servedAt)]
+        servedAt is None when the current locks never cover the queue up to that request
+        Assumes no new deposits, so liquidity only grows as locks expire
+        """
+        served = []
+        consumed = 0
+        previous = self.timestamp
+        for timestamp, amount in sorted(requests, key=lambda request: request[0]):
+            fillAt = None if previous is None else self.time_to_fill(consumed + amount)
+            if fillAt is not None:
+                fillAt = max(fillAt, timestamp, previous)
+                consumed += amount
+            previous = fillAt
+            served.append((timestamp, amount, fillAt))
+        return served
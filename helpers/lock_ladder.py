@@ -0,0 +1,246 @@
+from bisect import bisect_right
+
+from brownie import web3
+from eth_abi import decode_abi
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+
+from helpers.constants import WEEK, LOCK_DURATION
+from helpers.multicall import Call, Multicall, func
+
+"""
+  Index of the vlAURA locks held by an account (the strategy)
+  Unlock times are kept sorted with running totals, so
+  "how much is withdrawable at T" is a bisect instead of a walk over userLocks
+"""
+
+# userLocks read per multicall, the ladder length isn't known upfront
+LOCK_WINDOW = 32
+
+STAKED_TOPIC = web3.keccak(text="Staked(address,uint256,uint256)").hex()
+WITHDRAWN_TOPIC = web3.keccak(text="Withdrawn(address,uint256,bool)").hex()
+
+
+def unlock_time_of(timestamp):
+    """
+    Unlock time AuraLocker gives a lock made at timestamp
+    """
+    return timestamp // WEEK * WEEK + LOCK_DURATION
+
+
+class LockLadder:
+    def __init__(self, locker, account, window=LOCK_WINDOW):
+        self.locker = to_checksum_address(locker)
+        self.account = to_checksum_address(account)
+        self.window = window
+        # Sorted unlock times and the total locked up to and including each one
+        # Entries before head were withdrawn, they are dropped on compact
+        self.unlockTimes = []
+        self.cumulative = []
+        self.head = 0
+        # Block the ladder reflects, events after it are applied by sync
+        self.block = None
+
+    def __len__(self):
+        return len(self.unlockTimes) - self.head
+
+    # ===== Loading =====
+
+    def load(self, block=None):
+        """
+        Reads the unexpired ladder from userLocks, starting at nextUnlockIndex
+        All windows are pinned to the block of the first read
+        """
+        balances = Multicall(
+            [
+                Call(
+                    self.locker,
+                    [func.locker.balances, self.account],
+                    [["locked", None], ["nextUnlockIndex", None]],
+                )
+            ],
+            block_identifier=block,
+        )
+        data = balances()
+        self.block = balances.block
+
+        locks = []
+        index = data["nextUnlockIndex"]
+        while True:
+            calls = [
+                Call(
+                    self.locker,
+                    [func.locker.userLocks, self.account, i],
+                    [[(i, "amount"), None], [(i, "unlockTime"), None]],
+                )
+                for i in range(index, index + self.window)
+            ]
+            # Reading past the end of userLocks reverts, which marks the last window
+            multi = Multicall(calls, allow_failure=True, block_identifier=self.block)
+            result = multi()
+            for i, ok in zip(range(index, index + self.window), multi.success):
+                if not ok:
+                    break
+                locks.append((result[(i, "unlockTime")], result[(i, "amount")]))
+            if not all(multi.success):
+                break
+            index += self.window
+
+        self.unlockTimes = []
+        self.cumulative = []
+        self.head = 0
+        for unlockTime, amount in locks:
+            self.add(unlockTime, amount)
+
+        assert self.locked() == data["locked"], "Ladder doesn't match balances"
+        return self
+
+    # ===== Views =====
+
+    def base(self):
+        return self.cumulative[self.head - 1] if self.head > 0 else 0
+
+    def locked(self):
+        return self.cumulative[-1] - self.base() if self.cumulative else 0
+
+    def withdrawable_at(self, timestamp):
+        """
+        AURA processExpiredLocks would release at timestamp
+        """
+        i = bisect_right(self.unlockTimes, timestamp, self.head)
+        return self.cumulative[i - 1] - self.base() if i > self.head else 0
+
+    def next_unlock(self, timestamp):
+        """
+        First unlock time strictly after timestamp, None when nothing is left
+        """
+        i = bisect_right(self.unlockTimes, timestamp, self.head)
+        return self.unlockTimes[i] if i < len(self.unlockTimes) else None
+
+    def locks(self):
+        """
+        [(unlockTime, amount)] in unlock order
+        """
+        previous = self.base()
+        locks = []
+        for unlockTime, total in zip(
+            self.unlockTimes[self.head :], self.cumulative[self.head :]
+        ):
+            locks.append((unlockTime, total - previous))
+            previous = total
+        return locks
+
+    # ===== Updates =====
+
+    def add(self, unlockTime, amount):
+        if self.unlockTimes and unlockTime < self.unlockTimes[-1]:
+            raise ValueError("Locks must be added in unlock order")
+        if len(self) > 0 and unlockTime == self.unlockTimes[-1]:
+            # Same epoch, AuraLocker adds to the last lock
+            self.cumulative[-1] += amount
+        else:
+            self.unlockTimes.append(unlockTime)
+            previous = self.cumulative[-1] if self.cumulative else 0
+            self.cumulative.append(previous + amount)
+
+    def on_staked(self, lockedAmount, timestamp):
+        self.add(unlock_time_of(timestamp), lockedAmount)
+
+    def on_withdrawn(self, amount, timestamp):
+        """
+        processExpiredLocks releases every lock expired at timestamp
+        Returns False when the amount doesn't match, the ladder should be reloaded
+        """
+        i = bisect_right(self.unlockTimes, timestamp, self.head)
+        released = self.cumulative[i - 1] - self.base() if i > self.head else 0
+        self.head = i
+        self.compact()
+        return released == amount
+
+    def compact(self):
+        # Keep dropped entries around until they are most of the lists
+        if self.head > 0 and self.head * 2 >= len(self.unlockTimes):
+            base = self.base()
+            self.unlockTimes = self.unlockTimes[self.head :]
+            self.cumulative = [total - base for total in self.cumulative[self.head :]]
+            self.head = 0
+
+    def apply(self, name, amount, timestamp):
+        if name == "Staked":
+            self.on_staked(amount, timestamp)
+            return True
+        return self.on_withdrawn(amount, timestamp)
+
+    def is_lock_log(self, log):
+        """
+        Staked / Withdrawn log of the account, decoded from the raw topics since
+        no ABI in the project declares AuraLocker's events
+        """
+        topics = [HexBytes(topic) for topic in log["topics"]]
+        return (
+            log["address"].lower() == self.locker.lower()
+            and len(topics) > 1
+            and topics[0].hex() in [STAKED_TOPIC, WITHDRAWN_TOPIC]
+            and topics[1] == HexBytes(self.accountTopic())
+        )
+
+    def apply_log(self, log, timestamp):
+        if HexBytes(log["topics"][0]).hex() == STAKED_TOPIC:
+            paid, lockedAmount = decode_abi(
+                ["uint256", "uint256"], HexBytes(log["data"])
+            )
+            return self.apply("Staked", lockedAmount, timestamp)
+        amount, relocked = decode_abi(["uint256", "bool"], HexBytes(log["data"]))
+        return self.apply("Withdrawn", amount, timestamp)
+
+    def accountTopic(self):
+        return "0x" + self.account[2:].lower().rjust(64, "0")
+
+    def apply_tx(self, tx):
+        """
+        Applies the Staked / Withdrawn logs of a brownie transaction
+        A tx without lock logs of the account leaves the ladder (and its block) as is
+        """
+        if self.block is None:
+            return self.load(tx.block_number)
+        if tx.block_number <= self.block:
+            return self
+        logs = [log for log in tx.logs if self.is_lock_log(log)]
+        if not logs:
+            return self
+        for log in logs:
+            if not self.apply_log(log, tx.timestamp):
+                return self.load(tx.block_number)
+        self.block = tx.block_number
+        return self
+
+    def sync(self, block=None):
+        """
+        Applies the lock events emitted since the ladder's block
+        Falls back to a full load if they don't add up
+        """
+        if self.block is None:
+            return self.load(block)
+        if block is None:
+            block = web3.eth.blockNumber
+        if block <= self.block:
+            return self
+
+        logs = web3.eth.getLogs(
+            {
+                "address": self.locker,
+                "fromBlock": self.block + 1,
+                "toBlock": block,
+                "topics": [[STAKED_TOPIC, WITHDRAWN_TOPIC], self.accountTopic()],
+            }
+        )
+        timestamps = {}
+        for log in sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"])):
+            number = log["blockNumber"]
+            if number not in timestamps:
+                timestamps[number] = web3.eth.getBlock(number)["timestamp"]
+            if not self.apply_log(log, timestamps[number]):
+                return self.load(block)
+
+        self.block = block
+        return self
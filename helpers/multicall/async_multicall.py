@@ -0,0 +1,195 @@
+import asyncio
+import itertools
+
+import aiohttp
+from brownie import web3
+from eth_utils import to_hex
+from hexbytes import HexBytes
+
+from helpers.multicall.call import Call
+from helpers.multicall.constants import BATCH_TRANSPORT
+from helpers.multicall.multicall import Multicall
+
+# Requests in flight per provider, shared by every call using it
+DEFAULT_CONCURRENCY = 8
+
+
+def to_block_param(block_identifier):
+    if block_identifier is None:
+        return "latest"
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    return block_identifier
+
+
+class AsyncProvider:
+    """
+    Minimal JSON-RPC client with a pooled HTTP session and bounded concurrency
+    Create it once and share it across every AsyncCall / AsyncMulticall
+    """
+
+    def __init__(self, endpoint_uri, concurrency=DEFAULT_CONCURRENCY):
+        self.endpoint_uri = endpoint_uri
+        self.concurrency = concurrency
+        self.ids = itertools.count()
+        self.chainId = None
+        # Bound to the running loop on first use
+        self._session = None
+        self._semaphore = None
+
+    @classmethod
+    def from_web3(cls, concurrency=DEFAULT_CONCURRENCY):
+        """
+        Uses the endpoint brownie is connected to
+        """
+        return cls(web3.provider.endpoint_uri, concurrency)
+
+    async def session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def request(self, method, params):
+        session = await self.session()
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self.ids),
+            "method": method,
+            "params": params,
+        }
+        async with self._semaphore:
+            async with session.post(self.endpoint_uri, json=payload) as response:
+                body = await response.json()
+        if "error" in body:
+            raise ValueError(body["error"])
+        return body["result"]
+
+    async def batch(self, payload):
+        """
+        Sends a list of JSON-RPC requests in a single HTTP request
+        """
+        session = await self.session()
+        async with self._semaphore:
+            async with session.post(self.endpoint_uri, json=payload) as response:
+                return await response.json()
+
+    async def block_number(self, block_identifier=None):
+        if isinstance(block_identifier, int):
+            return block_identifier
+        block = await self.request(
+            "eth_getBlockByNumber", [to_block_param(block_identifier), False]
+        )
+        return int(block["number"], 16)
+
+    async def chain_id(self):
+        if self.chainId is None:
+            self.chainId = int(await self.request("eth_chainId", []), 16)
+        return self.chainId
+
+    async def eth_call(self, transaction, block_identifier=None):
+        params = [
+            {"to": transaction["to"], "data": to_hex(transaction["data"])},
+            to_block_param(block_identifier),
+        ]
+        return HexBytes(await self.request("eth_call", params))
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+class AsyncCall(Call):
+    async def __call__(self, provider, args=None, block_identifier=None):
+        args = args or self.args
+        calldata = self.signature.encode_data(args)
+        output = await provider.eth_call(
+            {"to": self.target, "data": calldata}, block_identifier
+        )
+        return self.decode_output(output)
+
+
+class AsyncMulticall(Multicall):
+    """
+    Same as Multicall, but sends its batches through an AsyncProvider
+    Batches after the first one run concurrently, pinned to the first one's block
+    """
+
+    def __init__(self, calls, provider, **kwargs):
+        super().__init__(calls, **kwargs)
+        self.provider = provider
+
+    @classmethod
+    def from_multicall(cls, multicall, provider):
+        """
+        Wraps an already compiled Multicall (e.g. a SnapshotManager plan) without re-encoding it
+        """
+        multi = cls(
+            multicall.calls,
+            provider,
+            batch_size=multicall.batch_size,
+            gas_limit=multicall.gas_limit,
+            max_calldata_bytes=multicall.max_calldata_bytes,
+            allow_failure=multicall.allow_failure,
+            block_identifier=multicall.block_identifier,
+            transport=multicall.transport,
+        )
+        multi.chainId = multicall.chainId
+        multi._aggregator = multicall._aggregator
+        multi._compiled = multicall._compiled
+        return multi
+
+    async def aggregate(self, calldata, block_identifier=None):
+        output = await self.provider.eth_call(
+            {"to": self._aggregator.target, "data": calldata}, block_identifier
+        )
+        return self.decode_aggregate(output)
+
+    async def rpc_batch(self, batch, payload, block):
+        responses = await self.provider.batch(self.rpc_requests(batch, payload, block))
+        return self.decode_rpc_batch(responses)
+
+    async def __call__(self, block_identifier=None):
+        if block_identifier is None:
+            block_identifier = self.block_identifier
+        if self._compiled is None:
+            self.chainId = await self.provider.chain_id()
+            self.compile()
+
+        result = {}
+        self.success = []
+        self.block = None
+        if not self._compiled:
+            return result
+
+        if self.transport == BATCH_TRANSPORT:
+            self.block = await self.provider.block_number(block_identifier)
+            outputs = await asyncio.gather(
+                *[
+                    self.rpc_batch(batch, payload, self.block)
+                    for (batch, payload) in self._compiled
+                ]
+            )
+            for (batch, payload), batchOutputs in zip(self._compiled, outputs):
+                self.collect(batch, batchOutputs, result)
+            return result
+
+        (batch, calldata), *rest = self._compiled
+        block, outputs = await self.aggregate(calldata, block_identifier)
+        self.block = block
+        self.collect(batch, outputs, result)
+
+        outputs = await asyncio.gather(
+            *[self.aggregate(calldata, block) for (batch, calldata) in rest]
+        )
+        for (batch, calldata), (block, batchOutputs) in zip(rest, outputs):
+            self.collect(batch, batchOutputs, result)
+        return result
@@ -1,19 +1,21 @@
 # Credit: https://github.com/banteg/multicall.py/blob/master/multicall/call.py
 from eth_utils import to_checksum_address
 from brownie import web3
-from helpers.multicall import Signature
+from helpers.multicall.signature import get_signature
 
 
 class Call:
-    def __init__(self, target, function, returns=None):
+    def __init__(self, target, function, returns=None, default=None):
         self.target = to_checksum_address(target)
         if isinstance(function, list):
             self.function, *self.args = function
         else:
             self.function = function
             self.args = None
-        self.signature = Signature(self.function)
+        self.signature = get_signature(self.function)
         self.returns = returns
+        # Value used for every return when the call fails in allow_failure mode
+        self.default = default
 
     @property
     def data(self):
@@ -29,8 +31,14 @@ class Call:
         else:
             return decoded if len(decoded) > 1 else decoded[0]
 
-    def __call__(self, args=None):
+    def default_output(self):
+        if self.returns:
+            return {name: self.default for (name, handler) in self.returns}
+        else:
+            return self.default
+
+    def __call__(self, args=None, block_identifier=None):
         args = args or self.args
         calldata = self.signature.encode_data(args)
-        output = web3.eth.call({"to": self.target, "data": calldata})
+        output = web3.eth.call({"to": self.target, "data": calldata}, block_identifier)
         return self.decode_output(output)
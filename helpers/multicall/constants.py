@@ -29,3 +29,24 @@ MULTICALL_ADDRESSES = {
     Network.Arbitrum: "0x7A7443F8c577d537f1d8cD4a629d40a3148Dd7ee",
     Network.Hardhat: "0x7A7443F8c577d537f1d8cD4a629d40a3148Dd7ee",
 }
+
+# Multicall3 is deployed at the same address on every network
+# https://github.com/mds1/multicall
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ADDRESSES = {network: MULTICALL3_ADDRESS for network in Network}
+
+# Budgets used to split a Multicall into several aggregate calls
+# Kept well below the default eth_call gas cap of geth / ganache (50M)
+MULTICALL_GAS_LIMIT = 25_000_000
+# Keeps request / response payloads under common node limits
+MULTICALL_MAX_CALLDATA_BYTES = 128 * 1024
+# Rough cost of a single view call made by the aggregator
+CALL_GAS_ESTIMATE = 40_000
+# Calldata cost of a non zero byte
+CALLDATA_BYTE_GAS = 16
+
+# How a Multicall reaches the node
+# aggregate: a single eth_call to the Multicall contract
+# batch: a JSON-RPC batch of eth_call, for chains without a Multicall deployed
+AGGREGATE_TRANSPORT = "aggregate"
+BATCH_TRANSPORT = "batch"
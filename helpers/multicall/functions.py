@@ -45,6 +45,7 @@ strategy = DotMap(
     sharesOfPool="sharesOfPool()(uint256)",
     sharesOfWant="sharesOfWant()(uint256)",
     sharesOf="sharesOf()(uint256)",
+    checkUpkeep="checkUpkeep(bytes)(bool,bytes)",
 )
 harvestFarm = DotMap(earned="earned()(uint256)")
 rewardPool = DotMap(
@@ -53,6 +54,17 @@ rewardPool = DotMap(
     # amount staked
     balanceOf="balanceOf(address)(uint256)",
 )
+locker = DotMap(
+    # (locked, nextUnlockIndex)
+    balances="balances(address)(uint112,uint32)",
+    # (amount, unlockTime)
+    userLocks="userLocks(address,uint256)(uint112,uint32)",
+    lockedBalances="lockedBalances(address)(uint256,uint256,uint256,(uint112,uint32)[])",
+)
+hiddenHand = DotMap(
+    claimed="claimed(bytes32,address)(uint256)",
+    rewards="rewards(bytes32)(address,bytes32,bytes32,uint256)",
+)
 digg = DotMap(sharesOf="sharesOf(address)(uint256)")
 diggFaucet = DotMap(
     # claimable rewards
@@ -68,6 +80,8 @@ func = DotMap(
     sett=sett,
     strategy=strategy,
     rewardPool=rewardPool,
+    locker=locker,
+    hiddenHand=hiddenHand,
     diggFaucet=diggFaucet,
     digg=digg,
     pancakeChef=pancakeChef,
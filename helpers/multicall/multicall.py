@@ -1,18 +1,120 @@
 # Credit: https://github.com/banteg/multicall.py/blob/master/multicall/multicall.py
 from typing import List
 
+import requests
 from brownie import web3
+from eth_abi.exceptions import DecodingError
+from eth_utils import to_hex
+from hexbytes import HexBytes
 
 from helpers.multicall import Call
-from helpers.multicall.constants import MULTICALL_ADDRESSES
+from helpers.multicall.constants import (
+    MULTICALL_ADDRESSES,
+    MULTICALL3_ADDRESSES,
+    MULTICALL_GAS_LIMIT,
+    MULTICALL_MAX_CALLDATA_BYTES,
+    CALL_GAS_ESTIMATE,
+    CALLDATA_BYTE_GAS,
+    AGGREGATE_TRANSPORT,
+    BATCH_TRANSPORT,
+)
 from rich.console import Console
 
 console = Console()
 
+# Transport picked for each (chainId, allow_failure), so the code check runs once
+_transports = {}
+
+
+def estimate_call_cost(call):
+    """
+    Returns the (gas, bytes) a call adds to an aggregate request
+    Each entry is abi encoded as (address, bytes) which adds 3 words of overhead
+    """
+    size = len(call.data) + 32 * 3
+    gas = CALL_GAS_ESTIMATE + size * CALLDATA_BYTE_GAS
+    return gas, size
+
+
+def chunk_calls(
+    calls,
+    batch_size=None,
+    gas_limit=MULTICALL_GAS_LIMIT,
+    max_calldata_bytes=MULTICALL_MAX_CALLDATA_BYTES,
+):
+    """
+    Splits calls into batches that fit within the gas and calldata budgets
+    batch_size optionally caps the number of calls per batch
+    """
+    batches = []
+    batch = []
+    batch_gas = 0
+    batch_bytes = 0
+
+    for call in calls:
+        gas, size = estimate_call_cost(call)
+        full = (
+            batch_gas + gas > gas_limit
+            or batch_bytes + size > max_calldata_bytes
+            or (batch_size is not None and len(batch) >= batch_size)
+        )
+        if batch and full:
+            batches.append(batch)
+            batch = []
+            batch_gas = 0
+            batch_bytes = 0
+
+        batch.append(call)
+        batch_gas += gas
+        batch_bytes += size
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def select_transport(chainId, allow_failure=False):
+    """
+    Uses the Multicall contract when it is deployed on the chain, a JSON-RPC batch otherwise
+    """
+    key = (chainId, allow_failure)
+    if key not in _transports:
+        addresses = MULTICALL3_ADDRESSES if allow_failure else MULTICALL_ADDRESSES
+        address = addresses.get(chainId)
+        deployed = address is not None and len(web3.eth.getCode(address)) > 0
+        _transports[key] = AGGREGATE_TRANSPORT if deployed else BATCH_TRANSPORT
+    return _transports[key]
+
 
 class Multicall:
-    def __init__(self, calls: List[Call]):
+    def __init__(
+        self,
+        calls: List[Call],
+        batch_size=None,
+        gas_limit=MULTICALL_GAS_LIMIT,
+        max_calldata_bytes=MULTICALL_MAX_CALLDATA_BYTES,
+        allow_failure=False,
+        block_identifier=None,
+        transport=None,
+    ):
         self.calls = calls
+        self.batch_size = batch_size
+        self.gas_limit = gas_limit
+        self.max_calldata_bytes = max_calldata_bytes
+        # When set, reverting calls return their defaults instead of reverting the batch
+        self.allow_failure = allow_failure
+        # Block to run at, defaults to latest
+        self.block_identifier = block_identifier
+        # Block number the last execution ran at, as returned by the aggregator
+        self.block = None
+        # Per call success flags of the last execution, same order as self.calls
+        self.success = []
+        # AGGREGATE_TRANSPORT or BATCH_TRANSPORT, picked by select_transport when None
+        self.transport = transport
+        self.chainId = None
+        self._aggregator = None
+        self._compiled = None
 
     def printCalls(self):
         for call in self.calls:
@@ -20,14 +122,145 @@ class Multicall:
                 {"target": call.target, "function": call.function, "args": call.args}
             )
 
-    def __call__(self):
-        aggregate = Call(
-            MULTICALL_ADDRESSES[web3.eth.chainId],
+    def batches(self):
+        return chunk_calls(
+            self.calls, self.batch_size, self.gas_limit, self.max_calldata_bytes
+        )
+
+    def failed(self):
+        return [call for call, ok in zip(self.calls, self.success) if not ok]
+
+    def aggregator(self):
+        if self.allow_failure:
+            return Call(
+                MULTICALL3_ADDRESSES[self.chainId],
+                "tryBlockAndAggregate(bool,(address,bytes)[])(uint256,bytes32,(bool,bytes)[])",
+            )
+        return Call(
+            MULTICALL_ADDRESSES[self.chainId],
             "aggregate((address,bytes)[])(uint256,bytes[])",
         )
-        args = [[[call.target, call.data] for call in self.calls]]
-        block, outputs = aggregate(args)
+
+    def compile(self):
+        """
+        Encodes the calldata of every batch once
+        The compiled plan is reused by every following execution
+        """
+        if self._compiled is None:
+            if self.chainId is None:
+                self.chainId = web3.eth.chainId
+            if self.transport is None:
+                self.transport = select_transport(self.chainId, self.allow_failure)
+
+            compiled = []
+            if self.transport == BATCH_TRANSPORT:
+                for batch in self.batches():
+                    compiled.append((batch, [call.data for call in batch]))
+            else:
+                aggregator = self.aggregator()
+                for batch in self.batches():
+                    args = [[call.target, call.data] for call in batch]
+                    args = [False, args] if self.allow_failure else [args]
+                    compiled.append((batch, aggregator.signature.encode_data(args)))
+                self._aggregator = aggregator
+            self._compiled = compiled
+        return self._compiled
+
+    def rpc_requests(self, batch, payload, block):
+        return [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "eth_call",
+                "params": [{"to": call.target, "data": to_hex(data)}, hex(block)],
+            }
+            for i, (call, data) in enumerate(zip(batch, payload))
+        ]
+
+    def decode_rpc_batch(self, responses):
+        """
+        Returns a (success, output) pair for each response of a JSON-RPC batch
+        """
+        outputs = []
+        for response in sorted(responses, key=lambda response: response["id"]):
+            if "error" in response:
+                if not self.allow_failure:
+                    raise ValueError(response["error"])
+                outputs.append((False, None))
+            else:
+                outputs.append((True, HexBytes(response["result"])))
+        return outputs
+
+    def rpc_batch(self, batch, payload, block):
+        response = requests.post(
+            web3.provider.endpoint_uri, json=self.rpc_requests(batch, payload, block)
+        )
+        response.raise_for_status()
+        return self.decode_rpc_batch(response.json())
+
+    def resolve_block(self, block_identifier):
+        """
+        A JSON-RPC batch has no aggregator to report its block, so pin it upfront
+        """
+        if isinstance(block_identifier, int):
+            return block_identifier
+        return web3.eth.getBlock(block_identifier or "latest")["number"]
+
+    def aggregate(self, calldata, block_identifier=None):
+        """
+        Returns the block number and a (success, output) pair for each call in the batch
+        """
+        aggregator = self._aggregator
+        output = web3.eth.call(
+            {"to": aggregator.target, "data": calldata}, block_identifier
+        )
+        return self.decode_aggregate(output)
+
+    def decode_aggregate(self, output):
+        aggregator = self._aggregator
+        if self.allow_failure:
+            block, blockHash, results = aggregator.decode_output(output)
+            return block, results
+
+        block, outputs = aggregator.decode_output(output)
+        return block, [(True, output) for output in outputs]
+
+    def decode(self, call, success, output):
+        if not success:
+            return False, call.default_output()
+        if not self.allow_failure:
+            return True, call.decode_output(output)
+        try:
+            return True, call.decode_output(output)
+        except DecodingError:
+            # Calls to targets without the function (or code) succeed with no data
+            return False, call.default_output()
+
+    def __call__(self, block_identifier=None):
+        if block_identifier is None:
+            block_identifier = self.block_identifier
+
         result = {}
-        for call, output in zip(self.calls, outputs):
-            result.update(call.decode_output(output))
+        self.success = []
+        self.block = None
+        compiled = self.compile()
+        if self.transport == BATCH_TRANSPORT:
+            self.block = self.resolve_block(block_identifier)
+            for batch, payload in compiled:
+                self.collect(batch, self.rpc_batch(batch, payload, self.block), result)
+            return result
+
+        for batch, calldata in compiled:
+            block, outputs = self.aggregate(calldata, block_identifier)
+            if self.block is None:
+                # Pin the remaining batches to the block the first one ran at
+                self.block = block
+                block_identifier = block
+            self.collect(batch, outputs, result)
         return result
+
+    def collect(self, batch, outputs, result):
+        for call, (success, output) in zip(batch, outputs):
+            ok, decoded = self.decode(call, success, output)
+            self.success.append(ok)
+            result.update(decoded)
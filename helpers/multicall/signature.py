@@ -1,8 +1,14 @@
 # Credit: https://github.com/banteg/multicall.py/blob/master/multicall/signature.py
+from functools import lru_cache
 
-from eth_abi import encode_single, decode_single
+from eth_abi.decoding import ContextFramesBytesIO
+from eth_abi.registry import registry
 from eth_utils import function_signature_to_4byte_selector
 
+# Bounds for the process wide caches, a snapshot uses a few dozen signatures
+SIGNATURE_CACHE_SIZE = 1024
+CODEC_CACHE_SIZE = 256
+
 
 def parse_signature(signature):
     """
@@ -25,6 +31,16 @@ def parse_signature(signature):
     return parts
 
 
+@lru_cache(maxsize=CODEC_CACHE_SIZE)
+def get_encoder(types):
+    return registry.get_encoder(types)
+
+
+@lru_cache(maxsize=CODEC_CACHE_SIZE)
+def get_decoder(types):
+    return registry.get_decoder(types)
+
+
 class Signature:
     def __init__(self, signature):
         self.signature = signature
@@ -33,13 +49,20 @@ class Signature:
         self.output_types = self.parts[2]
         self.function = "".join(self.parts[:2])
         self.fourbyte = function_signature_to_4byte_selector(self.function)
+        self.encoder = get_encoder(self.input_types)
+        self.decoder = get_decoder(self.output_types)
 
     def encode_data(self, args=None):
-        return (
-            self.fourbyte + encode_single(self.input_types, args)
-            if args
-            else self.fourbyte
-        )
+        return self.fourbyte + self.encoder(args) if args else self.fourbyte
 
     def decode_data(self, output):
-        return decode_single(self.output_types, output)
+        return self.decoder(ContextFramesBytesIO(output))
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def get_signature(signature):
+    """
+    Returns the interned Signature for the given string
+    Signatures are immutable so a single instance is shared by every Call
+    """
+    return Signature(signature)
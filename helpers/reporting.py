@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+from contextlib import contextmanager
+
+from rich.console import Console
+
+"""
+  Output sink for SnapshotManager, resolvers and helpers
+  SNAPSHOT_REPORT selects the level:
+  - table: print everything as it happens (default)
+  - json: one JSON line per event, tables are only rendered when an assertion fails
+  - silent: no output, tables are only rendered when an assertion fails
+"""
+
+SILENT = "silent"
+JSON = "json"
+TABLE = "table"
+LEVELS = [SILENT, JSON, TABLE]
+
+
+class Reporter:
+    def __init__(self, level=TABLE, stream=None):
+        assert level in LEVELS, "Unknown report level {}".format(level)
+        self.level = level
+        self.stream = stream or sys.stdout
+        self.console = Console(file=self.stream)
+        # Renderers kept until the enclosing check passes or fails
+        self.deferred = []
+        # Nesting of on_failure, output outside of it is dropped when not shown
+        self.depth = 0
+
+    def event(self, name, **fields):
+        """
+        Structured record, only written at the json level
+        e.g. reporter.event("snap", block=123)
+        Callable values are only called when the record is written
+        """
+        if self.level == JSON:
+            fields = {
+                key: value() if callable(value) else value
+                for key, value in fields.items()
+            }
+            fields["event"] = name
+            self.stream.write(json.dumps(fields, default=str) + "\n")
+
+    def text(self, message):
+        """
+        Human readable output, message may be a callable to defer formatting
+        """
+        if self.level == TABLE:
+            self.console.print(message() if callable(message) else message)
+        elif self.depth > 0:
+            self.deferred.append((self.console.print, message))
+
+    def table(self, render):
+        """
+        render is a callable returning the table, only called when it is shown
+        """
+        if self.level == TABLE:
+            self.write(render())
+        elif self.depth > 0:
+            self.deferred.append((self.write, render))
+
+    def write(self, output):
+        # Tables bypass rich so they are neither wrapped nor parsed for markup
+        print(output, file=self.stream)
+
+    def flush(self):
+        for show, message in self.deferred:
+            show(message() if callable(message) else message)
+        self.deferred = []
+
+    @contextmanager
+    def on_failure(self):
+        """
+        Shows the deferred output only if the wrapped checks raise
+        """
+        self.depth += 1
+        try:
+            yield
+        except Exception:
+            self.flush()
+            raise
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.deferred = []
+
+
+reporter = Reporter(os.environ.get("SNAPSHOT_REPORT", TABLE))
+
+
+def set_level(level):
+    assert level in LEVELS, "Unknown report level {}".format(level)
+    reporter.level = level
+    reporter.deferred = []
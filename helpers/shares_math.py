@@ -173,3 +173,136 @@ def get_report_fees(
         shares_management=shares_management,
         shares_perf_strategist=shares_perf_strategist,
     )
+
+
+"""
+  Batch versions of the functions above
+  Each argument is either a scalar or a sequence (list, tuple, numpy object array)
+  Scalars are broadcast, sequences must share their length
+  Math is done on Python ints so it floors exactly like Solidity, without overflow
+"""
+
+
+def _columns(*args):
+    length = None
+    for arg in args:
+        if not isinstance(arg, int):
+            if length is None:
+                length = len(arg)
+            assert len(arg) == length, "Batch arguments must share their length"
+    if length is None:
+        length = 1
+    return [[arg] * length if isinstance(arg, int) else arg for arg in args]
+
+
+def batch_from_want_to_shares(
+    want_deposited, total_supply_before_deposit, balance_before_deposit
+):
+    return [
+        (want * supply) // balance
+        for want, supply, balance in zip(
+            *_columns(
+                want_deposited, total_supply_before_deposit, balance_before_deposit
+            )
+        )
+    ]
+
+
+def batch_from_shares_to_want(shares_to_burn, ppfs_before_withdraw, vault_decimals):
+    return [
+        (shares * ppfs) // 10**decimals
+        for shares, ppfs, decimals in zip(
+            *_columns(shares_to_burn, ppfs_before_withdraw, vault_decimals)
+        )
+    ]
+
+
+def batch_get_withdrawal_fees_in_shares(
+    shares_to_burn,
+    ppfs_before_withdraw,
+    vault_decimals,
+    withdrawal_fee_bps,
+    total_supply_before_withdraw,
+    vault_balance_before_withdraw,
+):
+    return [
+        ((((shares * ppfs) // 10**decimals) * fee_bps) // MAX_BPS * supply) // balance
+        for shares, ppfs, decimals, fee_bps, supply, balance in zip(
+            *_columns(
+                shares_to_burn,
+                ppfs_before_withdraw,
+                vault_decimals,
+                withdrawal_fee_bps,
+                total_supply_before_withdraw,
+                vault_balance_before_withdraw,
+            )
+        )
+    ]
+
+
+def batch_get_report_fees(
+    total_harvest_gain,
+    performance_fee_treasury,
+    performance_fee_strategist,
+    management_fee,
+    time_since_last_harvest,
+    total_supply_before_deposit,
+    balance_before_deposit,
+):
+    """
+    Same as get_report_fees for many harvests at once
+    Returns a DotMap of lists instead of a list of DotMaps
+    """
+    shares_perf_treasury = []
+    shares_management = []
+    shares_perf_strategist = []
+
+    for (
+        gain,
+        fee_treasury,
+        fee_strategist,
+        fee_management,
+        time_passed,
+        supply,
+        balance_before,
+    ) in zip(
+        *_columns(
+            total_harvest_gain,
+            performance_fee_treasury,
+            performance_fee_strategist,
+            management_fee,
+            time_since_last_harvest,
+            total_supply_before_deposit,
+            balance_before_deposit,
+        )
+    ):
+        fee_in_want_treasury = (gain * fee_treasury) // MAX_BPS
+        management_fee_in_want = (
+            (fee_management * balance_before * time_passed) // SECS_PER_YEAR // MAX_BPS
+        )
+        fee_in_want_strategist = (gain * fee_strategist) // MAX_BPS
+
+        pool = (
+            balance_before
+            + gain
+            - fee_in_want_treasury
+            - management_fee_in_want
+            - fee_in_want_strategist
+        )
+        treasury = (fee_in_want_treasury * supply) // pool
+        supply += treasury
+        pool += fee_in_want_treasury
+
+        management = (management_fee_in_want * supply) // pool
+        supply += management
+        pool += management_fee_in_want
+
+        shares_perf_treasury.append(treasury)
+        shares_management.append(management)
+        shares_perf_strategist.append((fee_in_want_strategist * supply) // pool)
+
+    return DotMap(
+        shares_perf_treasury=shares_perf_treasury,
+        shares_management=shares_management,
+        shares_perf_strategist=shares_perf_strategist,
+    )
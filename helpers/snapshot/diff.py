@@ -0,0 +1,102 @@
+from itertools import zip_longest
+
+from tabulate import tabulate
+
+from helpers.snapshot.snap import Snap, _MISSING
+
+
+def delta(a, b):
+    if type(a) is int and type(b) is int:
+        return b - a
+    return None
+
+
+class SnapDiff:
+    """
+    Changes between two Snaps, found in a single pass over their aligned columns
+    Rendering is lazy, nothing is formatted until render() is called
+    """
+
+    def __init__(self, before: Snap, after: Snap):
+        assert before.columns is after.columns, "Snaps must share their columns"
+        self.before = before
+        self.after = after
+        self.columns = before.columns
+
+        # Column ids whose values differ, in column order
+        self.changedIds = [
+            i
+            for i, (a, b) in enumerate(
+                zip_longest(before.values, after.values, fillvalue=_MISSING)
+            )
+            if a is not b and a != b
+        ]
+        self._rendered = {}
+
+    def __bool__(self):
+        return len(self.changedIds) > 0
+
+    def __len__(self):
+        return len(self.changedIds)
+
+    def changed(self):
+        keys = self.columns.keys
+        return [keys[i] for i in self.changedIds]
+
+    def values(self, key):
+        i = self.columns.ids.get(key)
+        a = self.before.value(i)
+        b = self.after.value(i)
+        return (
+            None if a is _MISSING else a,
+            None if b is _MISSING else b,
+        )
+
+    def delta(self, key):
+        """
+        Absolute change of an integer metric, None for non integers
+        """
+        return delta(*self.values(key))
+
+    def relative(self, key):
+        """
+        Change of an integer metric relative to its value before, None when undefined
+        """
+        a, b = self.values(key)
+        d = delta(a, b)
+        if d is None or a == 0:
+            return None
+        return d / a
+
+    def rows(self):
+        """
+        Yields (key, before, after, delta) of every changed metric
+        """
+        keys = self.columns.keys
+        for i in self.changedIds:
+            a = self.before.value(i)
+            b = self.after.value(i)
+            a = None if a is _MISSING else a
+            b = None if b is _MISSING else b
+            yield keys[i], a, b, delta(a, b)
+
+    def render(self, format=None, tablefmt="grid"):
+        cacheKey = (format, tablefmt)
+        if cacheKey not in self._rendered:
+            table = []
+            for key, a, b, d in self.rows():
+                d = "-" if d is None else d
+                if format:
+                    a, b, d = format(key, a), format(key, b), format(key, d)
+                table.append([key, a, b, d])
+            self._rendered[cacheKey] = tabulate(
+                table, headers=["metric", "before", "after", "diff"], tablefmt=tablefmt
+            )
+        return self._rendered[cacheKey]
+
+
+def diff_series(snaps):
+    """
+    Diffs of every consecutive pair of a list of Snaps
+    """
+    return [SnapDiff(before, after) for before, after in zip(snaps, snaps[1:])]
@@ -0,0 +1,36 @@
+class HolderBalances:
+    """
+    Balances of many holders for a few tokens, stored as one column per token
+    Holders are indexed once, so a lookup is a dict hit plus a list index
+    """
+
+    def __init__(self, holders, tokenKeys, block):
+        self.block = block
+        self.holders = list(holders)
+        self.index = {holder: i for i, holder in enumerate(self.holders)}
+        self.columns = {tokenKey: [0] * len(self.holders) for tokenKey in tokenKeys}
+
+    def __len__(self):
+        return len(self.holders)
+
+    def balance(self, tokenKey, holder):
+        return self.columns[tokenKey][self.index[holder]]
+
+    def column(self, tokenKey):
+        return self.columns[tokenKey]
+
+    def total(self, tokenKey):
+        return sum(self.columns[tokenKey])
+
+    def changed(self, other, tokenKey):
+        """
+        Holders whose balance of tokenKey differs in other, which must track the same holders
+        """
+        assert self.holders == other.holders, "Holder sets differ"
+        return [
+            holder
+            for holder, a, b in zip(
+                self.holders, self.columns[tokenKey], other.columns[tokenKey]
+            )
+            if a != b
+        ]
@@ -1,23 +1,107 @@
+_MISSING = object()
+
+
+class SnapColumns:
+    """
+    Interns metric keys (e.g. "balances.want.user") to integer column ids
+    A single instance is shared by every Snap, so keys are stored once per process
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.keys = []
+        # (prefix, tokenKey, accountKey) -> column id, avoids building key strings on lookups
+        self.entityIds = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def id(self, key):
+        i = self.ids.get(key)
+        if i is None:
+            i = len(self.keys)
+            self.ids[key] = i
+            self.keys.append(key)
+        return i
+
+    def entityId(self, prefix, tokenKey, accountKey):
+        cacheKey = (prefix, tokenKey, accountKey)
+        i = self.entityIds.get(cacheKey)
+        if i is None:
+            i = self.ids.get(prefix + "." + tokenKey + "." + accountKey)
+            if i is None:
+                return None
+            self.entityIds[cacheKey] = i
+        return i
+
+
+columns = SnapColumns()
+
+
 class Snap:
-    def __init__(self, data, block, entityKeys):
-        self.data = data
+    def __init__(self, data, block, entityKeys, columns=columns):
+        self.columns = columns
         self.block = block
         self.entityKeys = entityKeys
+        # One slot per column id, _MISSING for columns this snap doesn't have
+        self.values = []
+        # Set when values is shared with another Snap, see fork
+        self.shared = False
+        for key, value in data.items():
+            self.set(key, value)
+
+    def fork(self, block, entityKeys):
+        """
+        New Snap with the same values, copied on the first write of either snap
+        """
+        snap = Snap({}, block, entityKeys, self.columns)
+        snap.values = self.values
+        snap.shared = True
+        self.shared = True
+        return snap
 
     # ===== Getters =====
 
+    @property
+    def data(self):
+        keys = self.columns.keys
+        return {
+            keys[i]: value
+            for i, value in enumerate(self.values)
+            if value is not _MISSING
+        }
+
+    def value(self, i):
+        if i is None or i >= len(self.values):
+            return _MISSING
+        return self.values[i]
+
     def balances(self, tokenKey, accountKey):
-        return self.data["balances." + tokenKey + "." + accountKey]
+        value = self.value(self.columns.entityId("balances", tokenKey, accountKey))
+        if value is _MISSING:
+            raise KeyError("balances." + tokenKey + "." + accountKey)
+        return value
 
     def shares(self, tokenKey, accountKey):
-        return self.data["shares." + tokenKey + "." + accountKey]
+        value = self.value(self.columns.entityId("shares", tokenKey, accountKey))
+        if value is _MISSING:
+            raise KeyError("shares." + tokenKey + "." + accountKey)
+        return value
 
     def get(self, key):
-        if key not in self.data.keys():
+        value = self.value(self.columns.ids.get(key))
+        if value is _MISSING:
             raise Exception("Key {} not found in snap data".format(key))
-        return self.data[key]
+        return value
 
     # ===== Setters =====
 
     def set(self, key, value):
-        self.data[key] = value
+        if self.shared:
+            self.values = list(self.values)
+            self.shared = False
+        i = self.columns.id(key)
+        missing = i + 1 - len(self.values)
+        if missing > 0:
+            self.values.extend([_MISSING] * missing)
+        self.values[i] = value
@@ -0,0 +1,138 @@
+import json
+import sqlite3
+
+from helpers.snapshot.snap import Snap
+
+# Bytes of the database file SQLite may memory map for reads
+DEFAULT_MMAP_SIZE = 1 << 30
+
+
+class SnapStore:
+    """
+    Append only SQLite store of Snaps keyed by block
+    Values are kept one row per (metric, block) so series queries only touch one index range
+    Reads are served through SQLite's memory mapping and streamed from the cursor
+    """
+
+    def __init__(self, path, mmap_size=DEFAULT_MMAP_SIZE):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA mmap_size = {}".format(int(mmap_size)))
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS metrics (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS snaps (
+                block INTEGER PRIMARY KEY,
+                entityKeys TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS snap_values (
+                metric INTEGER NOT NULL,
+                block INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (metric, block)
+            ) WITHOUT ROWID;
+            """
+        )
+        self.metricIds = dict(
+            (key, i) for (i, key) in self.db.execute("SELECT id, key FROM metrics")
+        )
+
+    def metricId(self, key):
+        i = self.metricIds.get(key)
+        if i is None:
+            cursor = self.db.execute("INSERT INTO metrics (key) VALUES (?)", (key,))
+            i = cursor.lastrowid
+            self.metricIds[key] = i
+        return i
+
+    # ===== Writes =====
+
+    def append(self, snap: Snap):
+        """
+        Stores the snap, a block that is already stored is left untouched
+        """
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO snaps (block, entityKeys) VALUES (?, ?)",
+                (snap.block, json.dumps(snap.entityKeys)),
+            )
+            if cursor.rowcount == 0:
+                return
+            self.db.executemany(
+                "INSERT INTO snap_values (metric, block, value) VALUES (?, ?, ?)",
+                [
+                    (self.metricId(key), snap.block, json.dumps(value))
+                    for key, value in snap.data.items()
+                ],
+            )
+
+    # ===== Reads =====
+
+    def blocks(self, start=None, end=None):
+        where, params = self.blockRange(start, end)
+        query = "SELECT block FROM snaps" + where + " ORDER BY block"
+        return [block for (block,) in self.db.execute(query, params)]
+
+    def series(self, key, start=None, end=None):
+        """
+        Yields (block, value) of a metric between blocks start..end (inclusive)
+        e.g. store.series("sett.getPricePerFullShare", A, B)
+        """
+        i = self.metricIds.get(key)
+        if i is None:
+            return
+        where, params = self.blockRange(start, end)
+        query = (
+            "SELECT block, value FROM snap_values"
+            + (where + " AND" if where else " WHERE")
+            + " metric = ? ORDER BY block"
+        )
+        for block, value in self.db.execute(query, params + [i]):
+            yield block, json.loads(value)
+
+    def balances(self, tokenKey, accountKey, start=None, end=None):
+        return self.series("balances." + tokenKey + "." + accountKey, start, end)
+
+    def load(self, block):
+        row = self.db.execute(
+            "SELECT entityKeys FROM snaps WHERE block = ?", (block,)
+        ).fetchone()
+        if row is None:
+            raise Exception("Block {} not found in snap store".format(block))
+        data = {
+            key: json.loads(value)
+            for key, value in self.db.execute(
+                "SELECT metrics.key, snap_values.value FROM snap_values"
+                " JOIN metrics ON metrics.id = snap_values.metric"
+                " WHERE snap_values.block = ? ORDER BY metrics.id",
+                (block,),
+            )
+        }
+        return Snap(data, block, json.loads(row[0]))
+
+    def snaps(self, start=None, end=None):
+        """
+        Yields the stored Snaps between blocks start..end, one at a time
+        """
+        for block in self.blocks(start, end):
+            yield self.load(block)
+
+    def blockRange(self, start, end):
+        clauses = []
+        params = []
+        if start is not None:
+            clauses.append("block >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("block <= ?")
+            params.append(end)
+        if not clauses:
+            return "", params
+        return " WHERE " + " AND ".join(clauses), params
+
+    def close(self):
+        self.db.close()
@@ -1,6 +1,12 @@
+from helpers.reporting import reporter
+
+
 # Assert approximate integer
 def approx(actual, expected, percentage_threshold):
-    print(actual, expected, percentage_threshold)
+    reporter.text(lambda: "{} {} {}".format(actual, expected, percentage_threshold))
+    reporter.event(
+        "approx", actual=actual, expected=expected, threshold=percentage_threshold
+    )
     diff = int(abs(actual - expected))
     # 0 diff should automtically be a match
     if diff == 0:
@@ -0,0 +1,248 @@
+from collections import deque
+
+from dotmap import DotMap
+
+from _setup.config import (
+    PERFORMANCE_FEE_GOVERNANCE,
+    PERFORMANCE_FEE_STRATEGIST,
+    WITHDRAWAL_FEE,
+    MANAGEMENT_FEE,
+)
+from helpers.constants import WEEK, LOCK_DURATION
+from helpers.shares_math import MAX_BPS, from_shares_to_want, get_report_fees
+
+"""
+  Pure Python model of the vlAURA vault and strategy
+  Mirrors TheVault / MyStrategy accounting so scenarios run offline, no fork needed
+"""
+
+# Share of idle want the vault sends to the strategy on earn
+TO_EARN_BPS = 9_500
+# MyStrategy._withdrawSome reverts when it can't return this share of the request
+WITHDRAWAL_SAFETY_BPS = 9_980
+VAULT_DECIMALS = 18
+
+TREASURY = "treasury"
+STRATEGIST = "strategist"
+
+
+class VaultSimulator:
+    def __init__(
+        self,
+        performance_fee_governance=PERFORMANCE_FEE_GOVERNANCE,
+        performance_fee_strategist=PERFORMANCE_FEE_STRATEGIST,
+        withdrawal_fee=WITHDRAWAL_FEE,
+        management_fee=MANAGEMENT_FEE,
+        to_earn_bps=TO_EARN_BPS,
+        start_time=0,
+    ):
+        self.performance_fee_governance = performance_fee_governance
+        self.performance_fee_strategist = performance_fee_strategist
+        self.withdrawal_fee = withdrawal_fee
+        self.management_fee = management_fee
+        self.to_earn_bps = to_earn_bps
+
+        self.time = start_time
+        self.last_harvested_at = start_time
+
+        # Vault
+        self.vault_want = 0
+        self.total_supply = 0
+        self.shares = {}
+
+        # Strategy
+        self.strategy_want = 0
+        # [unlockTime, amount] in unlock order, as AuraLocker.userLocks
+        self.locks = deque()
+        self.locked = 0
+
+        # Accounting
+        self.fees = DotMap(
+            shares_perf_treasury=0,
+            shares_management=0,
+            shares_perf_strategist=0,
+            shares_withdrawal=0,
+        )
+        self.failed_withdrawals = []
+        self.history = []
+
+    # ===== Views =====
+
+    def balance(self):
+        return self.vault_want + self.strategy_want + self.locked
+
+    def ppfs(self):
+        if self.total_supply == 0:
+            return 10**VAULT_DECIMALS
+        return self.balance() * 10**VAULT_DECIMALS // self.total_supply
+
+    def unlockable(self):
+        return sum(
+            amount for unlock_time, amount in self.locks if unlock_time <= self.time
+        )
+
+    def position(self, user):
+        shares = self.shares.get(user, 0)
+        return DotMap(
+            shares=shares,
+            want=from_shares_to_want(shares, self.ppfs(), VAULT_DECIMALS),
+        )
+
+    # ===== Vault actions =====
+
+    def mint(self, user, amount, pool):
+        shares = (
+            amount if self.total_supply == 0 else amount * self.total_supply // pool
+        )
+        self.shares[user] = self.shares.get(user, 0) + shares
+        self.total_supply += shares
+        return shares
+
+    def deposit(self, user, amount):
+        pool = self.balance()
+        self.vault_want += amount
+        return self.mint(user, amount, pool)
+
+    def earn(self):
+        available = self.vault_want * self.to_earn_bps // MAX_BPS
+        self.vault_want -= available
+        self.lock(available)
+        return available
+
+    def withdraw(self, user, shares):
+        """
+        Returns the want sent to the user, None if the strategy couldn't free enough
+        """
+        assert shares <= self.shares.get(user, 0), "Not enough shares"
+        r = self.balance() * shares // self.total_supply
+
+        if self.vault_want < r:
+            to_withdraw = r - self.vault_want
+            withdrawn = self.strategy_withdraw(to_withdraw)
+            if withdrawn is None:
+                self.failed_withdrawals.append((self.time, user, shares))
+                return None
+            if withdrawn < to_withdraw:
+                r = self.vault_want + withdrawn
+            self.vault_want += withdrawn
+            self.strategy_want -= withdrawn
+
+        self.shares[user] -= shares
+        self.total_supply -= shares
+
+        fee = r * self.withdrawal_fee // MAX_BPS
+        self.vault_want -= r - fee
+        if fee > 0:
+            self.fees.shares_withdrawal += self.mint(
+                TREASURY, fee, self.balance() - fee
+            )
+        return r - fee
+
+    def harvest(self, gain):
+        """
+        Compounds gain (in want) into the locker and issues fee shares as reportHarvest does
+        """
+        fees = get_report_fees(
+            gain,
+            self.performance_fee_governance,
+            self.performance_fee_strategist,
+            self.management_fee,
+            self.time - self.last_harvested_at,
+            self.total_supply,
+            self.balance(),
+        )
+        self.lock(gain)
+
+        self.shares[TREASURY] = (
+            self.shares.get(TREASURY, 0)
+            + fees.shares_perf_treasury
+            + fees.shares_management
+        )
+        self.shares[STRATEGIST] = (
+            self.shares.get(STRATEGIST, 0) + fees.shares_perf_strategist
+        )
+        self.total_supply += (
+            fees.shares_perf_treasury
+            + fees.shares_management
+            + fees.shares_perf_strategist
+        )
+        for key in [
+            "shares_perf_treasury",
+            "shares_management",
+            "shares_perf_strategist",
+        ]:
+            self.fees[key] += fees[key]
+
+        self.last_harvested_at = self.time
+        return fees
+
+    # ===== Strategy actions =====
+
+    def lock(self, amount):
+        if amount == 0:
+            return
+        unlock_time = self.time // WEEK * WEEK + LOCK_DURATION
+        if self.locks and self.locks[-1][0] == unlock_time:
+            self.locks[-1][1] += amount
+        else:
+            self.locks.append([unlock_time, amount])
+        self.locked += amount
+
+    def process_expired_locks(self):
+        unlocked = 0
+        while self.locks and self.locks[0][0] <= self.time:
+            unlocked += self.locks.popleft()[1]
+        self.locked -= unlocked
+        self.strategy_want += unlocked
+        return unlocked
+
+    def reinvest(self):
+        self.process_expired_locks()
+        amount = self.strategy_want
+        self.strategy_want = 0
+        self.lock(amount)
+        return amount
+
+    def strategy_withdraw(self, amount):
+        """
+        MyStrategy._withdrawSome: unlock if needed, then apply the safety check
+        """
+        if amount > self.strategy_want:
+            self.process_expired_locks()
+        available = self.strategy_want
+        if available < amount * WITHDRAWAL_SAFETY_BPS // MAX_BPS:
+            return None
+        return min(amount, available)
+
+    # ===== Scenarios =====
+
+    def record(self):
+        self.history.append(
+            DotMap(
+                time=self.time,
+                ppfs=self.ppfs(),
+                balance=self.balance(),
+                total_supply=self.total_supply,
+                vault_want=self.vault_want,
+                strategy_want=self.strategy_want,
+                locked=self.locked,
+                unlockable=self.unlockable(),
+            )
+        )
+
+    def run(self, scenario, weeks):
+        """
+        scenario: iterable of (week, action, kwargs), e.g. (3, "deposit", {"user": "alice", "amount": 10**18})
+        Actions of a week run in the given order, then the epoch is recorded
+        """
+        actions = sorted(scenario, key=lambda action: action[0])
+        i = 0
+        start = self.time
+        for week in range(weeks):
+            self.time = start + week * WEEK
+            while i < len(actions) and actions[i][0] <= week:
+                _, action, kwargs = actions[i]
+                getattr(self, action)(**kwargs)
+                i += 1
+            self.record()
+        return self.history
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+
+from brownie import MyStrategy, chain
+from tabulate import tabulate
+
+from helpers.harvest_quoter import HarvestQuoter
+from helpers.utils import val
+
+QUOTES = 20
+# Quoted when nothing is pending, e.g. on a fresh fork
+DEFAULT_AMOUNT = 1_000 * 10**18
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def ms(seconds):
+    return "{:.3f}".format(seconds * 1000)
+
+
+def main():
+    """
+    Times harvest route quotes: cold (new block, every leg re-read) and cached
+    The strategy is HARVEST_QUOTE_STRATEGY, or the last MyStrategy deployed
+    """
+    address = os.environ.get("HARVEST_QUOTE_STRATEGY")
+    strategy = MyStrategy.at(address) if address else MyStrategy[-1]
+    quoter = HarvestQuoter(strategy)
+
+    amount = quoter.pending() or DEFAULT_AMOUNT
+    cold = []
+    cached = []
+    for i in range(QUOTES):
+        chain.mine()
+        quote, elapsed = timed(lambda: quoter.quote(amount))
+        cold.append(elapsed)
+        quote, elapsed = timed(lambda: quoter.quote(amount))
+        cached.append(elapsed)
+
+    print(
+        tabulate(
+            [
+                ["auraBAL in", val(quote.auraBal)],
+                ["BAL/ETH BPT", val(quote.bpt)],
+                ["WETH", val(quote.weth)],
+                ["AURA", val(quote.aura)],
+                ["minOutBps", quote.minOutBps],
+            ]
+        )
+    )
+    print(
+        tabulate(
+            [
+                ["cold", ms(sum(cold) / QUOTES), ms(max(cold))],
+                ["cached", ms(sum(cached) / QUOTES), ms(max(cached))],
+            ],
+            headers=["quote", "mean ms", "max ms"],
+        ),
+        file=sys.stderr,
+    )
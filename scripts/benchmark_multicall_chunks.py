@@ -0,0 +1,46 @@
+import time
+
+from brownie import network, interface
+from eth_utils import to_checksum_address
+from rich.console import Console
+from tabulate import tabulate
+
+from _setup.config import WANT
+from helpers.multicall import Call, Multicall, as_wei, func
+
+console = Console()
+
+NUM_HOLDERS = 2_000
+BATCH_SIZES = [None, 50, 100, 250, 500, 1_000, 2_000]
+RUNS = 3
+
+
+def main():
+    """
+    Times a Multicall of balanceOf for NUM_HOLDERS addresses at different chunk sizes
+    Run against a local fork: brownie run benchmark_multicall_chunks --network mainnet-fork
+    """
+    console.print("You are using the", network.show_active(), "network")
+
+    want = interface.IERC20Detailed(WANT)
+    holders = [to_checksum_address("{:040x}".format(i + 1)) for i in range(NUM_HOLDERS)]
+    calls = [
+        Call(want.address, [func.erc20.balanceOf, holder], [[holder, as_wei]])
+        for holder in holders
+    ]
+
+    table = []
+    for batch_size in BATCH_SIZES:
+        multi = Multicall(calls, batch_size=batch_size)
+        num_batches = len(multi.batches())
+        try:
+            start = time.perf_counter()
+            for _ in range(RUNS):
+                data = multi()
+            elapsed = (time.perf_counter() - start) / RUNS
+            assert len(data) == NUM_HOLDERS
+            table.append([batch_size or "auto", num_batches, "{:.3f}".format(elapsed)])
+        except Exception as e:
+            table.append([batch_size or "auto", num_batches, "failed: {}".format(e)])
+
+    print(tabulate(table, headers=["batch size", "batches", "seconds"]))
@@ -0,0 +1,47 @@
+import time
+
+from brownie import network, interface
+from eth_utils import to_checksum_address
+from rich.console import Console
+from tabulate import tabulate
+
+from _setup.config import WANT
+from helpers.multicall import Call, Multicall, as_wei, func
+from helpers.multicall.constants import AGGREGATE_TRANSPORT, BATCH_TRANSPORT
+
+console = Console()
+
+CALL_COUNTS = [10, 100, 500]
+RUNS = 5
+
+
+def main():
+    """
+    Compares a Multicall aggregate against a JSON-RPC batch of eth_call
+    Run against a local fork: brownie run benchmark_multicall_transport --network mainnet-fork
+    """
+    console.print("You are using the", network.show_active(), "network")
+
+    want = interface.IERC20Detailed(WANT)
+
+    table = []
+    for count in CALL_COUNTS:
+        holders = [to_checksum_address("{:040x}".format(i + 1)) for i in range(count)]
+        calls = [
+            Call(want.address, [func.erc20.balanceOf, holder], [[holder, as_wei]])
+            for holder in holders
+        ]
+        row = [count]
+        results = []
+        for transport in [AGGREGATE_TRANSPORT, BATCH_TRANSPORT]:
+            multi = Multicall(calls, transport=transport)
+            start = time.perf_counter()
+            for _ in range(RUNS):
+                data = multi()
+            row.append("{:.3f}".format((time.perf_counter() - start) / RUNS))
+            results.append(data)
+        # Both transports must agree
+        assert results[0] == results[1]
+        table.append(row)
+
+    print(tabulate(table, headers=["calls", "aggregate (s)", "rpc batch (s)"]))
@@ -0,0 +1,64 @@
+import sys
+import time
+
+from tabulate import tabulate
+
+from helpers import reporting
+from helpers.reporting import reporter, set_level
+from helpers.snapshot.diff import SnapDiff
+from helpers.snapshot.snap import Snap
+from helpers.utils import approx, val
+
+ACTIONS = 2_000
+METRICS = 40
+APPROX_PER_ACTION = 5
+
+
+def format(key, value):
+    return val(value) if type(value) is int else value
+
+
+def replay():
+    """
+    Mimics a confirm_* cycle: a compare table plus a few approx assertions
+    """
+    for action in range(ACTIONS):
+        before = Snap(
+            {"metric.{}".format(i): 10**18 * i for i in range(METRICS)}, action, []
+        )
+        after = Snap(
+            {"metric.{}".format(i): 10**18 * i + action for i in range(METRICS)},
+            action + 1,
+            [],
+        )
+        with reporter.on_failure():
+            reporter.text("=== Compare ===")
+            diff = SnapDiff(before, after)
+            reporter.table(lambda: diff.render(format))
+            reporter.event(
+                "compare",
+                before=before.block,
+                after=after.block,
+                changed=lambda: {key: d for key, a, b, d in diff.rows()},
+            )
+            for i in range(APPROX_PER_ACTION):
+                assert approx(after.get("metric.1"), before.get("metric.1"), 1)
+
+
+def main():
+    """
+    Times a long replay of confirm cycles in each report level
+    Output goes to stdout, so terminal cost is part of the measure
+    """
+    results = []
+    for level in reporting.LEVELS:
+        set_level(level)
+        start = time.perf_counter()
+        replay()
+        results.append([level, "{:.3f}".format(time.perf_counter() - start)])
+    set_level(reporting.TABLE)
+
+    print(
+        tabulate(results, headers=["level", "seconds for {} actions".format(ACTIONS)]),
+        file=sys.stderr,
+    )
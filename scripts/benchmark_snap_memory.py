@@ -0,0 +1,86 @@
+import sys
+
+from rich.console import Console
+from tabulate import tabulate
+
+from helpers.snapshot.snap import Snap, SnapColumns
+
+console = Console()
+
+TOKENS = ["want", "sett", "auraBal"]
+ENTITIES = [
+    "sett",
+    "strategy",
+    "governance",
+    "treasury",
+    "strategist",
+    "locker",
+    "badgerTree",
+]
+METRICS = [
+    "sett.balance",
+    "sett.available",
+    "sett.getPricePerFullShare",
+    "sett.decimals",
+    "sett.totalSupply",
+    "sett.withdrawalFee",
+    "sett.managementFee",
+    "sett.lastHarvestedAt",
+    "sett.performanceFeeGovernance",
+    "sett.performanceFeeStrategist",
+    "strategy.balanceOfPool",
+    "strategy.balanceOfWant",
+    "strategy.balanceOf",
+]
+USER_COUNTS = [1, 100, 1_000]
+
+
+def make_data(users):
+    keys = list(METRICS)
+    entities = ENTITIES + ["user{}".format(i) for i in range(users)]
+    for token in TOKENS:
+        for entity in entities:
+            keys.append("balances." + token + "." + entity)
+    # Values are shared by both representations, only the containers differ
+    return {key: 10**18 + i for i, key in enumerate(keys)}
+
+
+def dict_size(data):
+    # The dict and its own copy of every key string, as each old Snap held
+    return sys.getsizeof(data) + sum(sys.getsizeof(key) for key in data)
+
+
+def main():
+    """
+    Reports the per snapshot memory of the dict based and the columnar Snap
+    The interned keys are paid once per process and reported separately
+    """
+    table = []
+    for users in USER_COUNTS:
+        data = make_data(users)
+        columns = SnapColumns()
+        snap = Snap(data, 0, [], columns)
+        before = dict_size(data)
+        after = sys.getsizeof(snap.values)
+        table.append(
+            [
+                len(data),
+                before,
+                after,
+                "{:.0%}".format(1 - after / before),
+                dict_size(columns.ids),
+            ]
+        )
+
+    print(
+        tabulate(
+            table,
+            headers=[
+                "metrics",
+                "dict bytes / snap",
+                "columnar bytes / snap",
+                "saved",
+                "interned keys (once)",
+            ],
+        )
+    )
@@ -0,0 +1,90 @@
+import time
+
+from rich.console import Console
+from tabulate import tabulate
+
+from helpers.multicall import Call, as_wei, func
+from helpers.multicall.signature import get_signature, get_encoder, get_decoder
+
+console = Console()
+
+# Shape of a SnapshotManager.snap call list
+TOKENS = ["want", "sett", "auraBal"]
+ENTITIES = [
+    "sett",
+    "strategy",
+    "governance",
+    "treasury",
+    "strategist",
+    "locker",
+    "badgerTree",
+    "user",
+]
+SETT_FUNCTIONS = [
+    func.sett.balance,
+    func.sett.available,
+    func.sett.getPricePerFullShare,
+    func.erc20.decimals,
+    func.erc20.totalSupply,
+    func.sett.withdrawalFee,
+    func.sett.managementFee,
+    func.sett.lastHarvestedAt,
+    func.sett.performanceFeeGovernance,
+    func.sett.performanceFeeStrategist,
+    func.strategy.balanceOfPool,
+    func.strategy.balanceOfWant,
+    func.strategy.balanceOf,
+]
+SNAPS = 1_000
+
+
+def address(i):
+    return "0x{:040x}".format(i + 1)
+
+
+def build_snap_calls():
+    calls = []
+    for t, token in enumerate(TOKENS):
+        for e, entity in enumerate(ENTITIES):
+            calls.append(
+                Call(
+                    address(t),
+                    [func.erc20.balanceOf, address(100 + e)],
+                    [["balances." + token + "." + entity, as_wei]],
+                )
+            )
+    for i, function in enumerate(SETT_FUNCTIONS):
+        calls.append(Call(address(50), [function], [[str(i), as_wei]]))
+    # Encoding is part of the per snapshot cost
+    return [call.data for call in calls]
+
+
+def clear_caches():
+    get_signature.cache_clear()
+    get_encoder.cache_clear()
+    get_decoder.cache_clear()
+
+
+def time_snaps(cold):
+    start = time.perf_counter()
+    for _ in range(SNAPS):
+        if cold:
+            clear_caches()
+        build_snap_calls()
+    return (time.perf_counter() - start) / SNAPS
+
+
+def main():
+    """
+    Measures the Python overhead of building the calls of one snapshot
+    with and without the Signature cache (no RPC involved)
+    """
+    cold = time_snaps(cold=True)
+    warm = time_snaps(cold=False)
+
+    table = [
+        ["uncached", "{:.1f}".format(cold * 1e6)],
+        ["cached", "{:.1f}".format(warm * 1e6)],
+    ]
+    print(tabulate(table, headers=["signatures", "us per snapshot"]))
+    console.print("Speedup: {:.1f}x".format(cold / warm))
@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from tabulate import tabulate
+
+"""
+  Gas of every tests/gas path on the current MyStrategy against an earlier revision
+  Usage: python scripts/compare_gas.py <revision> [-k expression]
+  e.g. python scripts/compare_gas.py <1.2 commit> -k "claim_bribes or sweep_rewards"
+  Needs the same mainnet fork setup as brownie test, the contract is restored on exit
+"""
+
+CONTRACT = "contracts/MyStrategy.sol"
+MAX_BPS = 10_000
+
+
+def measure(path, args):
+    """
+    Runs the gas suite recording every path into the baseline at path
+    """
+    env = dict(os.environ, GAS_BASELINE_PATH=path, UPDATE_GAS_BASELINE="1")
+    subprocess.run(["brownie", "test", "tests/gas"] + args, env=env, check=True)
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    revision, args = sys.argv[1], sys.argv[2:]
+    with open(CONTRACT) as f:
+        current = f.read()
+    previous = subprocess.run(
+        ["git", "show", "{}:{}".format(revision, CONTRACT)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    directory = tempfile.mkdtemp()
+    try:
+        with open(CONTRACT, "w") as f:
+            f.write(previous)
+        before = measure(os.path.join(directory, "before.json"), args)
+    finally:
+        with open(CONTRACT, "w") as f:
+            f.write(current)
+    after = measure(os.path.join(directory, "after.json"), args)
+
+    table = []
+    for name in sorted(set(before) | set(after)):
+        a = before.get(name)
+        b = after.get(name)
+        delta = b - a if a is not None and b is not None else None
+        bps = delta * MAX_BPS // a if delta is not None and a else None
+        table.append([name, a, b, delta, bps])
+    print(tabulate(table, headers=["path", revision[:10], "current", "delta", "bps"]))
+
+
+if __name__ == "__main__":
+    main()
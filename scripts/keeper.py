@@ -0,0 +1,34 @@
+import asyncio
+import os
+
+from brownie import accounts, network, MyStrategy
+
+from helpers.keeper import Keeper, PERFORM_UPKEEP
+
+import click
+from rich.console import Console
+
+console = Console()
+
+
+def main():
+    """
+    Runs the upkeep loop for the strategies in KEEPER_STRATEGIES (comma separated)
+    KEEPER_METHOD picks performUpkeep (default) or manualProcessExpiredLocks
+    """
+    click.echo(f"You are using the '{network.show_active()}' network")
+    if network.show_active() == "development":
+        keeper = accounts[0]
+    else:
+        keeper = accounts.load(
+            click.prompt("Account", type=click.Choice(accounts.load()))
+        )
+    click.echo(f"You are using: 'keeper' [{keeper.address}]")
+
+    strategies = [
+        MyStrategy.at(address.strip())
+        for address in os.environ["KEEPER_STRATEGIES"].split(",")
+    ]
+    method = os.environ.get("KEEPER_METHOD", PERFORM_UPKEEP)
+
+    asyncio.run(Keeper(strategies, keeper, method=method).run())
@@ -0,0 +1,73 @@
+import random
+import sys
+import time
+
+from tabulate import tabulate
+
+from helpers.utils import val
+from helpers.vault_simulator import VaultSimulator, TREASURY, STRATEGIST
+
+USERS = 20_000
+WEEKS = 3 * 52
+# auraBAL rewards compounded each week, in AURA
+WEEKLY_GAIN = 2_000 * 10**18
+
+
+def scenario(users, weeks, seed=0):
+    """
+    Users join over the first year and a quarter of them leave after their lock expired
+    """
+    rng = random.Random(seed)
+    actions = []
+    for user in range(users):
+        week = rng.randrange(0, 52)
+        actions.append(
+            (
+                week,
+                "deposit",
+                {"user": user, "amount": rng.randrange(10**18, 10**22)},
+            )
+        )
+    for week in range(weeks):
+        actions.append((week, "earn", {}))
+        actions.append((week, "harvest", {"gain": WEEKLY_GAIN}))
+        actions.append((week, "process_expired_locks", {}))
+    return actions
+
+
+def main():
+    sim = VaultSimulator()
+    start = time.perf_counter()
+    history = sim.run(scenario(USERS, WEEKS), WEEKS)
+
+    leaving = range(0, USERS, 4)
+    withdrawn = 0
+    for user in leaving:
+        withdrawn += sim.withdraw(user, sim.shares[user]) or 0
+    elapsed = time.perf_counter() - start
+
+    rows = [
+        [
+            epoch.time // (7 * 86400),
+            val(epoch.ppfs),
+            val(epoch.balance),
+            val(epoch.locked),
+            val(epoch.strategy_want),
+        ]
+        for epoch in history[::13]
+    ]
+    print(tabulate(rows, headers=["week", "ppfs", "balance", "locked", "unlocked"]))
+    print(
+        tabulate(
+            [
+                ["users", USERS],
+                ["weeks", WEEKS],
+                ["withdrawn", val(withdrawn)],
+                ["failed withdrawals", len(sim.failed_withdrawals)],
+                ["treasury", val(sim.position(TREASURY).want)],
+                ["strategist", val(sim.position(STRATEGIST).want)],
+                ["seconds", "{:.3f}".format(elapsed)],
+            ]
+        ),
+        file=sys.stderr,
+    )
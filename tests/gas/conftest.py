@@ -0,0 +1,70 @@
+import os
+
+import pytest
+from brownie import MockToken
+
+from helpers.gas_baseline import GasBaseline
+
+"""
+  Gas benchmarks of the strategy's hot paths
+  Run with `brownie test tests/gas`, refresh the baseline with UPDATE_GAS_BASELINE=1
+  The measured gas and its delta to the baseline are printed after the run
+"""
+
+# GAS_BASELINE_PATH points the suite at another baseline, see scripts/compare_gas.py
+BASELINE_PATH = os.environ.get(
+    "GAS_BASELINE_PATH", os.path.join(os.path.dirname(__file__), "gas_baseline.json")
+)
+
+baseline = GasBaseline(BASELINE_PATH)
+
+
+def pytest_terminal_summary(terminalreporter):
+    rows = baseline.report()
+    if not rows:
+        return
+    terminalreporter.write_sep("=", "gas")
+    for name, expected, gas, delta in rows:
+        change = "new" if delta is None else "{:+d} bps".format(delta)
+        terminalreporter.write_line(
+            "{:<55} {:>10} {:>10} {:>10}".format(name, str(expected), gas, change)
+        )
+
+
+@pytest.fixture(scope="session")
+def gas_baseline():
+    yield baseline
+    if baseline.update:
+        baseline.save()
+
+
+@pytest.fixture
+def record_gas(gas_baseline):
+    """
+    record_gas("harvest[weeks=1]", tx) fails the test if the path regressed
+    A path without a baseline is skipped, its gas still shows in the summary
+    """
+
+    def record(name, tx):
+        error = gas_baseline.record(name, tx.gas_used)
+        assert error is None, error
+        if gas_baseline.missing(name):
+            pytest.skip(
+                "{} has no baseline, record it with UPDATE_GAS_BASELINE=1".format(name)
+            )
+        return tx.gas_used
+
+    return record
+
+
+@pytest.fixture
+def mock_tokens(deployer):
+    def deploy(count):
+        return [
+            MockToken.deploy(
+                "Mock {}".format(i), "MOCK{}".format(i), {"from": deployer}
+            )
+            for i in range(count)
+        ]
+
+    return deploy
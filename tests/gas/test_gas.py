@@ -0,0 +1,136 @@
+import pytest
+from brownie import chain, web3
+
+from helpers.constants import MaxUint256, WEEK, LOCK_DURATION
+
+REDIRECTION_FEE = 1_000  ## 10%
+
+
+def add_rewards(tokens, reward_distributor, strategy, deployer, amount=10**18):
+    claims = []
+    for token in tokens:
+        identifier = web3.keccak(text=token.symbol())
+        reward_distributor.addReward(identifier, token, {"from": deployer})
+        token.mint(reward_distributor, amount, {"from": deployer})
+        claims.append((identifier, strategy, amount, []))
+    return claims
+
+
+def redirect(tokens, strategy, recepient, governance):
+    for token in tokens:
+        strategy.setRedirectionToken(
+            token, recepient, REDIRECTION_FEE, {"from": governance}
+        )
+
+
+@pytest.mark.parametrize("weeks", [1, 4])
+def test_gas_harvest(setup_strat, governance, record_gas, weeks):
+    chain.sleep(weeks * WEEK)
+    chain.mine()
+
+    tx = setup_strat.harvest({"from": governance})
+    record_gas("harvest[weeks={}]".format(weeks), tx)
+
+
+@pytest.mark.parametrize(
+    "claims,redirected", [(1, 0), (10, 0), (25, 0), (25, 5), (25, 25)]
+)
+def test_gas_claim_bribes(
+    strategy,
+    reward_distributor,
+    bribes_processor,
+    strategist,
+    governance,
+    deployer,
+    randomUser,
+    mock_tokens,
+    record_gas,
+    claims,
+    redirected,
+):
+    tokens = mock_tokens(claims)
+    batch = add_rewards(tokens, reward_distributor, strategy, deployer)
+    redirect(tokens[:redirected], strategy, randomUser, governance)
+
+    tx = strategy.claimBribesFromHiddenHand(
+        reward_distributor, batch, {"from": strategist}
+    )
+    assert tx.events.count("RewardsCollected") == claims - redirected
+    record_gas(
+        "claimBribesFromHiddenHand[claims={},redirected={}]".format(claims, redirected),
+        tx,
+    )
+
+
+@pytest.mark.parametrize("claims,tokens", [(25, 5), (25, 1)])
+def test_gas_claim_bribes_shared_tokens(
+    strategy,
+    reward_distributor,
+    bribes_processor,
+    strategist,
+    deployer,
+    mock_tokens,
+    record_gas,
+    claims,
+    tokens,
+):
+    ## Several identifiers paying the same token
+    rewards = mock_tokens(tokens)
+    batch = []
+    for i in range(claims):
+        token = rewards[i % tokens]
+        identifier = web3.keccak(text="{}-{}".format(token.symbol(), i))
+        reward_distributor.addReward(identifier, token, {"from": deployer})
+        token.mint(reward_distributor, 10**18, {"from": deployer})
+        batch.append((identifier, strategy, 10**18, []))
+
+    tx = strategy.claimBribesFromHiddenHand(
+        reward_distributor, batch, {"from": strategist}
+    )
+    ## Works on 1.2 too so the baseline can be recorded there, the one event per
+    ## token check lives in test_claim_bribes.py
+    record_gas(
+        "claimBribesFromHiddenHand[claims={},tokens={}]".format(claims, tokens), tx
+    )
+
+
+@pytest.mark.parametrize("tokens,redirected", [(1, 0), (10, 0), (50, 0), (50, 50)])
+def test_gas_sweep_rewards(
+    strategy,
+    bribes_processor,
+    strategist,
+    governance,
+    deployer,
+    randomUser,
+    mock_tokens,
+    record_gas,
+    tokens,
+    redirected,
+):
+    rewards = mock_tokens(tokens)
+    for token in rewards:
+        token.mint(strategy, 10**18, {"from": deployer})
+    redirect(rewards[:redirected], strategy, randomUser, governance)
+
+    tx = strategy.sweepRewards(rewards, {"from": strategist})
+    assert all(token.balanceOf(strategy) == 0 for token in rewards)
+    record_gas("sweepRewards[tokens={},redirected={}]".format(tokens, redirected), tx)
+
+
+@pytest.mark.parametrize("locks", [1, 4, 8])
+def test_gas_perform_upkeep(
+    vault, strategy, want, deployer, governance, randomUser, record_gas, locks
+):
+    ## One lock per epoch, all expired by the upkeep
+    deposit = want.balanceOf(deployer) // (2 * locks)
+    want.approve(vault, MaxUint256, {"from": deployer})
+    for i in range(locks):
+        vault.deposit(deposit, {"from": deployer})
+        vault.earn({"from": governance})
+        chain.sleep(WEEK)
+    chain.sleep(LOCK_DURATION)
+    chain.mine()
+
+    tx = strategy.performUpkeep(b"", {"from": randomUser})
+    assert strategy.balanceOfPool() == 0
+    record_gas("performUpkeep[locks={}]".format(locks), tx)
@@ -1,7 +1,10 @@
+import asyncio
+
 import pytest
 import brownie
 from brownie import *
 from helpers.constants import EmptyBytes32
+from helpers.keeper import Keeper
 from eth_utils import encode_hex
 
 """
@@ -95,4 +98,44 @@ def test_chainlink_function_unlocks(setup_strat, want, vault, deployer, randomUs
     assert want.balanceOf(setup_strat) > initial_strat_b
 
     ## More rigorously, we got the exact unlocked_bal
-    assert want.balanceOf(setup_strat) == initial_strat_b + unlocked_bal
\ No newline at end of file
+    assert want.balanceOf(setup_strat) == initial_strat_b + unlocked_bal
+
+
+def keeper_tick(keeper):
+    async def tick():
+        try:
+            return await keeper.tick()
+        finally:
+            await keeper.close()
+
+    return asyncio.run(tick())
+
+
+def test_keeper_processes_expired_locks(
+    setup_strat, want, deployer, randomUser, locker
+):
+    keeper = Keeper([setup_strat], randomUser)
+
+    ## Nothing to unlock, sleeps towards the next unlock
+    txs, delay = keeper_tick(keeper)
+    assert txs == []
+    unlock = keeper.next_unlock(chain.time())
+    assert unlock is not None
+    assert delay == min(unlock - chain[-1].timestamp, keeper.max_sleep)
+
+    chain.sleep(unlock - chain.time() + 1)
+
+    ## A random function to avoid Ganache Simulation isues
+    want.approve(locker, 123, {"from": deployer})
+
+    initial_strat_b = want.balanceOf(setup_strat)
+    in_locker_balance, _ = locker.balances(setup_strat)
+
+    txs, delay = keeper_tick(keeper)
+    assert len(txs) == 1
+    assert keeper.nonce == randomUser.nonce
+
+    ## Unlocked everything, the ladder followed the Withdrawn event
+    assert want.balanceOf(setup_strat) == initial_strat_b + in_locker_balance
+    assert keeper.ladders[setup_strat.address].locked() == 0
+    assert delay == keeper.max_sleep
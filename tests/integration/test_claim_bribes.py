@@ -1,6 +1,9 @@
+import json
+
 import pytest
 import brownie
 from helpers.constants import AddressZero
+from helpers.hidden_hand import load_claims, plan_claims
 from brownie import (
     accounts,
     interface,
@@ -254,4 +257,162 @@ def test_claim_bribes_with_redirection(
     assert badger.balanceOf(treasury) == badger_recepient_balance_before + badger_amount
     assert gno.balanceOf(gno_recepient) == gno_recepient_balance_before + gno_amount - expected_gno_fee_amount
     assert weth.balanceOf(weth_recepient) == weth_recepient_balance_before + eth_amount - expected_weth_fee_amount
-    assert usdc.balanceOf(bribes_processor) == usdc_processor_balance_before + usdc_amount
\ No newline at end of file
+    assert usdc.balanceOf(bribes_processor) == usdc_processor_balance_before + usdc_amount
+
+
+def test_claim_bribes_dedupes_tokens(
+    badger,
+    gno,
+    gno_recepient,
+    vault,
+    strategy,
+    reward_distributor,
+    bribes_processor,
+    strategist,
+    deployer,
+    governance,
+):
+    treasury = vault.treasury()
+
+    # Two more identifiers paying the same tokens, e.g. bribes from two proposals
+    badger_identifier_2 = web3.keccak(text="BADGER_2")
+    gno_identifier_2 = web3.keccak(text="GNO_2")
+    reward_distributor.addReward(badger_identifier_2, badger, {"from": deployer})
+    reward_distributor.addReward(gno_identifier_2, gno, {"from": deployer})
+
+    # GNO is redirected with a 15% fee
+    strategy.setRedirectionToken(gno, gno_recepient, 1500, {"from": governance})
+
+    badger_amounts = [
+        badger.balanceOf(reward_distributor) // 4,
+        badger.balanceOf(reward_distributor) // 3,
+    ]
+    gno_amounts = [
+        gno.balanceOf(reward_distributor) // 4,
+        gno.balanceOf(reward_distributor) // 3,
+    ]
+    badger_amount = sum(badger_amounts)
+    gno_amount = sum(gno_amounts)
+
+    badger_processor_balance_before = badger.balanceOf(bribes_processor)
+    gno_recepient_balance_before = gno.balanceOf(gno_recepient)
+    gno_treasury_balance_before = gno.balanceOf(treasury)
+
+    claim_tx = strategy.claimBribesFromHiddenHand(
+        reward_distributor,
+        [
+            (BADGER_IDENTIFIER, strategy, badger_amounts[0], []),
+            (GNO_IDENTIFIER, strategy, gno_amounts[0], []),
+            (badger_identifier_2, strategy, badger_amounts[1], []),
+            (gno_identifier_2, strategy, gno_amounts[1], []),
+        ],
+        {"from": strategist},
+    )
+
+    # One transfer and one event per token
+    event = claim_tx.events["RewardsCollected"]
+    assert len(event) == 1
+    assert event[0]["token"] == badger
+    assert event[0]["amount"] == badger_amount
+
+    expected_gno_fee_amount = gno_amount * 1500 // 10000
+    event = claim_tx.events["RedirectionFee"]
+    assert len(event) == 1
+    assert event[0]["token"] == gno
+    assert event[0]["amount"] == expected_gno_fee_amount
+
+    event = claim_tx.events["TokenRedirection"]
+    assert len(event) == 1
+    assert event[0]["destination"] == gno_recepient
+    assert event[0]["amount"] == gno_amount - expected_gno_fee_amount
+
+    assert (
+        badger.balanceOf(bribes_processor)
+        == badger_processor_balance_before + badger_amount
+    )
+    assert (
+        gno.balanceOf(gno_recepient)
+        == gno_recepient_balance_before + gno_amount - expected_gno_fee_amount
+    )
+    assert (
+        gno.balanceOf(treasury) == gno_treasury_balance_before + expected_gno_fee_amount
+    )
+    assert badger.balanceOf(strategy) == 0
+    assert gno.balanceOf(strategy) == 0
+
+
+def test_claim_planner_skips_claimed_and_splits_batches(
+    want,
+    badger,
+    gno,
+    usdc,
+    strategy,
+    reward_distributor,
+    bribes_processor,
+    strategist,
+    tmp_path,
+):
+    tokens = [
+        (WANT_IDENTIFIER, want),
+        (BADGER_IDENTIFIER, badger),
+        (GNO_IDENTIFIER, gno),
+        (USDC_IDENTIFIER, usdc),
+    ]
+    amounts = {
+        identifier: token.balanceOf(reward_distributor) // 2
+        for identifier, token in tokens
+    }
+    distribution = {
+        "data": [
+            {
+                "token": token.address,
+                "claimMetadata": {
+                    "identifier": identifier.hex(),
+                    "account": strategy.address,
+                    "amount": str(amounts[identifier]),
+                    "merkleProof": [],
+                },
+            }
+            for identifier, token in tokens
+        ]
+    }
+    path = tmp_path / "distribution.json"
+    path.write_text(json.dumps(distribution))
+    claims = load_claims(path, strategy)
+    assert len(claims) == 4
+
+    ## WANT was claimed already, claiming it again would revert the batch
+    strategy.claimBribesFromHiddenHand(
+        reward_distributor, [claims[0]], {"from": strategist}
+    )
+    with brownie.reverts("Already claimed"):
+        strategy.claimBribesFromHiddenHand(
+            reward_distributor, claims, {"from": strategist}
+        )
+
+    ## A budget that fits two claims
+    pair = strategy.claimBribesFromHiddenHand.estimate_gas(
+        reward_distributor, claims[1:3], {"from": strategist}
+    )
+    plan = plan_claims(strategy, reward_distributor, claims, strategist, pair)
+    assert plan.failing == []
+    assert [batch.claims for batch in plan.batches] == [claims[1:3], claims[3:]]
+
+    balances_before = {
+        token.address: token.balanceOf(bribes_processor) for _, token in tokens
+    }
+    for batch in plan.batches:
+        tx = strategy.claimBribesFromHiddenHand(
+            reward_distributor, batch.claims, {"from": strategist}
+        )
+        assert tx.gas_used <= batch.gas
+
+    for identifier, token in tokens[1:]:
+        assert (
+            token.balanceOf(bribes_processor)
+            == balances_before[token.address] + amounts[identifier]
+        )
+
+    ## Everything is claimed, nothing left to plan
+    plan = plan_claims(strategy, reward_distributor, claims, strategist)
+    assert plan.batches == []
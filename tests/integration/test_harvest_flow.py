@@ -44,6 +44,69 @@ def test_deposit_withdraw_single_user_flow(
     snap.settWithdraw(shares // 2 - 1, {"from": deployer})
 
 
+def test_session_reuses_snapshots_between_actions(deployer, vault, strategy, want):
+    snap = SnapshotManager(vault, strategy, "StrategySnapshot")
+
+    taken = []
+    snapOriginal = snap.snap
+
+    def countedSnap(*args, **kwargs):
+        taken.append(1)
+        return snapOriginal(*args, **kwargs)
+
+    snap.snap = countedSnap
+
+    depositAmount = want.balanceOf(deployer) // 4
+    assert depositAmount > 0
+    want.approve(vault, MaxUint256, {"from": deployer})
+
+    with snap.session():
+        snap.settDeposit(depositAmount, {"from": deployer})
+        snap.settDeposit(depositAmount, {"from": deployer})
+
+    ## The second deposit reuses the after snapshot of the first one
+    assert len(taken) == 3
+
+    chain.mine()
+
+    ## Outside of a session every action takes both snapshots
+    snap.settDeposit(depositAmount, {"from": deployer})
+    assert len(taken) == 5
+
+
+def test_harvest_audits_holders(setup_strat, deployer, vault, keeper):
+    snap = SnapshotManager(vault, setup_strat, "StrategySnapshot")
+    holders = [deployer.address] + [account.address for account in accounts[1:]]
+
+    chain.sleep(days(1))
+    chain.mine()
+
+    snap.settHarvest({"from": keeper}, holders=holders)
+
+    ## Holders are not leaked into the tracked entities
+    assert "user" not in snap.entities
+
+    balances = snap.snapHolders(holders)
+    assert len(balances) == len(holders)
+    assert balances.balance("sett", deployer.address) == vault.balanceOf(deployer)
+
+
+def test_incremental_snapshots_match_full_reads(
+    deployer, vault, strategy, want, keeper
+):
+    snap = SnapshotManager(vault, strategy, "StrategySnapshot", incremental=True)
+
+    want.approve(vault, MaxUint256, {"from": deployer})
+    snap.settDeposit(want.balanceOf(deployer) // 2, {"from": deployer})
+    snap.settEarn({"from": keeper})
+
+    ## The last incremental snapshot must agree with a full re-read of the same block
+    incremental = snap.snaps[max(snap.snaps)]
+    full = snap.snap({"user": keeper.address})
+    assert full.block == incremental.block
+    assert full.data == incremental.data
+
+
 def test_single_user_harvest_flow(deployer, vault, strategy, want, keeper, governance):
     # Setup
     snap = SnapshotManager(vault, strategy, "StrategySnapshot")
@@ -1,7 +1,9 @@
 import pytest
 import brownie
 from brownie import *
-from helpers.constants import MaxUint256
+from helpers.constants import MaxUint256, WEEK, LOCK_DURATION
+from helpers.lock_ladder import LockLadder
+from helpers.liquidity_forecast import LiquidityForecaster
 
 
 def test_withdraw_more_than_liquid_tries_to_unlock(
@@ -18,3 +20,74 @@ def test_withdraw_more_than_liquid_tries_to_unlock(
 
     with brownie.reverts():
         vault.withdraw(can_withdraw + 100)  ## Expect to fail as lock is not expired
+
+
+def assert_ladder_matches(ladder, locker, strategy):
+    total, unlockable, locked, lockData = locker.lockedBalances(strategy)
+    assert ladder.locked() == total
+    assert ladder.withdrawable_at(chain.time()) == unlockable
+    assert [lock for lock in ladder.locks() if lock[0] > chain.time()] == [
+        (unlockTime, amount) for amount, unlockTime in lockData
+    ]
+
+
+def test_lock_ladder_tracks_locker(
+    setup_strat, deployer, governance, vault, strategy, want, locker
+):
+    ladder = LockLadder(locker, strategy).load()
+    assert len(ladder) > 0
+    assert_ladder_matches(ladder, locker, strategy)
+
+    ## A lock in a later epoch is added from the tx events
+    chain.sleep(WEEK)
+    vault.deposit(want.balanceOf(deployer) // 2, {"from": deployer})
+    tx = vault.earn({"from": governance})
+    ladder.apply_tx(tx)
+    assert len(ladder) == 2
+    assert_ladder_matches(ladder, locker, strategy)
+
+    ## Nothing is withdrawable before the first unlock
+    firstUnlock = ladder.next_unlock(chain.time())
+    assert ladder.withdrawable_at(firstUnlock - 1) == 0
+    assert ladder.withdrawable_at(firstUnlock) == ladder.locks()[0][1]
+
+    chain.sleep(LOCK_DURATION)
+    chain.mine()
+    assert_ladder_matches(ladder, locker, strategy)
+
+    ## Logs since the last update are replayed by sync
+    strategy.manualProcessExpiredLocks({"from": deployer})
+    ladder.sync()
+    assert ladder.locked() == locker.lockedBalances(strategy)[0]
+    assert ladder.withdrawable_at(chain.time()) == 0
+
+
+def test_liquidity_forecast_matches_withdrawals(
+    setup_strat, deployer, vault, strategy, want, locker
+):
+    forecast = LiquidityForecaster(vault, strategy).update()
+    liquid = want.balanceOf(vault) + strategy.balanceOfWant()
+    assert forecast.curve()[0][1] == liquid
+    assert forecast.curve()[-1][1] == liquid + locker.lockedBalances(strategy)[0]
+
+    ## The first request fits in the idle want, the second waits for the lock
+    perShare = vault.getPricePerFullShare()
+    shares = vault.balanceOf(deployer)
+    liquidShares = liquid * 10**18 // perShare
+    ## Stamped at the forecast's block, chain.time() runs ahead of it after a sleep
+    requestTime = forecast.timestamp
+    served = forecast.simulate(
+        [(requestTime, liquid), (requestTime, shares * perShare // 10**18 - liquid)]
+    )
+    assert served[0][2] == requestTime
+    assert served[1][2] == forecast.ladder.next_unlock(requestTime)
+
+    vault.withdraw(liquidShares, {"from": deployer})
+    with brownie.reverts():
+        vault.withdraw(vault.balanceOf(deployer), {"from": deployer})
+
+    chain.sleep(served[1][2] - chain.time())
+    chain.mine()
+    forecast.update()
+    assert forecast.max_withdrawal_at(chain.time()) >= vault.balance() - 1
+    vault.withdraw(vault.balanceOf(deployer), {"from": deployer})
@@ -0,0 +1,100 @@
+import pytest
+from brownie import *
+from helpers.multicall import Call, Multicall, func
+from helpers.multicall.multicall import chunk_calls, estimate_call_cost
+from helpers.multicall.constants import AGGREGATE_TRANSPORT, BATCH_TRANSPORT
+from helpers.SnapshotManager import SnapshotManager
+
+
+def test_allow_failure_fills_defaults(deployer, vault, want):
+    calls = [
+        Call(want.address, [func.erc20.balanceOf, deployer.address], [["want", None]]),
+        ## A plain ERC20 has no sharesOf, the call reverts
+        Call(want.address, func.strategy.sharesOf, [["shares", None]], default=0),
+        Call(vault.address, func.sett.balance, [["sett", None]]),
+        ## No code at the target, the call succeeds with no data to decode
+        Call(deployer.address, func.erc20.totalSupply, [["eoa", None]], default=0),
+    ]
+
+    multi = Multicall(calls, allow_failure=True)
+    data = multi()
+    assert data["want"] == want.balanceOf(deployer)
+    assert data["sett"] == vault.balance()
+    assert data["shares"] == 0
+    assert data["eoa"] == 0
+    assert multi.success == [True, False, True, False]
+    assert multi.failed() == [calls[1], calls[3]]
+
+    ## Without allow_failure a single revert fails the whole batch
+    with pytest.raises(Exception):
+        Multicall(calls)()
+
+
+def test_batch_transport_matches_aggregate(deployer, vault, strategy, want):
+    ## The fork always has Multicall, force each transport on the snapshot calls
+    snap = SnapshotManager(vault, strategy, "StrategySnapshot")
+    calls = snap.add_snap_calls(snap.entities)
+    block = chain.height
+
+    aggregate = Multicall(calls, transport=AGGREGATE_TRANSPORT)
+    batch = Multicall(calls, transport=BATCH_TRANSPORT)
+    assert batch(block) == aggregate(block)
+    assert batch.block == aggregate.block == block
+
+    ## Latest is pinned to a block number upfront
+    assert batch() == aggregate()
+    assert batch.block == aggregate.block
+
+    ## Failing calls are flagged the same way
+    calls = [
+        Call(want.address, [func.erc20.balanceOf, deployer.address], [["want", None]]),
+        Call(want.address, func.strategy.sharesOf, [["shares", None]], default=0),
+    ]
+    aggregate = Multicall(calls, allow_failure=True, transport=AGGREGATE_TRANSPORT)
+    batch = Multicall(calls, allow_failure=True, transport=BATCH_TRANSPORT)
+    assert batch(block) == aggregate(block)
+    assert batch.success == aggregate.success == [True, False]
+
+
+def test_chunk_calls_respects_every_budget(deployer, want):
+    ## Same signature and args, every call costs the same
+    calls = [
+        Call(want.address, [func.erc20.balanceOf, deployer.address], [[i, None]])
+        for i in range(10)
+    ]
+    gas, size = estimate_call_cost(calls[0])
+    assert size == len(calls[0].data) + 32 * 3
+
+    assert chunk_calls(calls) == [calls]
+    assert chunk_calls([]) == []
+
+    ## Room for 3 calls per batch, whichever budget is the limit
+    for batches in [
+        chunk_calls(calls, batch_size=3),
+        chunk_calls(calls, gas_limit=gas * 3 + gas // 2),
+        chunk_calls(calls, max_calldata_bytes=size * 3 + size // 2),
+    ]:
+        assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+        assert [call for batch in batches for call in batch] == calls
+
+    ## The tightest budget wins
+    batches = chunk_calls(calls, batch_size=4, gas_limit=gas * 2)
+    assert [len(batch) for batch in batches] == [2, 2, 2, 2, 2]
+
+    ## A call over budget on its own still gets a batch
+    assert chunk_calls(calls[:2], gas_limit=gas // 2) == [[calls[0]], [calls[1]]]
+
+
+def test_batches_merge_like_a_single_batch(deployer, vault, strategy, want):
+    snap = SnapshotManager(vault, strategy, "StrategySnapshot")
+    snap.addEntity("user", deployer.address)
+    calls = snap.add_snap_calls(snap.entities)
+    block = chain.height
+
+    single = Multicall(calls)
+    batched = Multicall(calls, batch_size=3)
+    assert len(single.batches()) == 1
+    assert len(batched.batches()) > 1
+
+    assert batched(block) == single(block)
+    assert batched.block == single.block == block
@@ -0,0 +1,127 @@
+import asyncio
+
+from brownie import *
+from helpers.constants import MaxUint256
+from helpers.SnapshotManager import SnapshotManager, gather_snaps
+from helpers.snapshot.store import SnapStore
+
+
+def test_snap_store_round_trip(tmp_path, deployer, vault, strategy, want):
+    path = str(tmp_path / "snaps.db")
+    store = SnapStore(path)
+    snap = SnapshotManager(vault, strategy, "StrategySnapshot", store=store)
+
+    trackedUsers = {"user": deployer.address}
+    before = snap.snap(trackedUsers)
+    want.approve(vault, MaxUint256, {"from": deployer})
+    vault.deposit(want.balanceOf(deployer) // 2, {"from": deployer})
+    after = snap.snap(trackedUsers)
+
+    assert store.blocks() == [before.block, after.block]
+    assert list(store.series("sett.balance")) == [
+        (before.block, before.get("sett.balance")),
+        (after.block, after.get("sett.balance")),
+    ]
+    assert list(store.balances("want", "user", end=before.block)) == [
+        (before.block, before.balances("want", "user"))
+    ]
+    assert list(store.series("sett.balance", start=after.block)) == [
+        (after.block, after.get("sett.balance"))
+    ]
+    assert list(store.series("not.a.metric")) == []
+
+    ## A block that is already stored is left untouched
+    store.append(after)
+    assert store.blocks() == [before.block, after.block]
+    store.close()
+
+    ## Metric ids are read back when the store is reopened
+    store = SnapStore(path)
+    for original in [before, after]:
+        loaded = store.load(original.block)
+        assert loaded.block == original.block
+        assert loaded.entityKeys == original.entityKeys
+        assert loaded.data == original.data
+    store.close()
+
+
+def test_snap_diff_of_a_deposit(deployer, vault, strategy, want):
+    snap = SnapshotManager(vault, strategy, "StrategySnapshot")
+    trackedUsers = {"user": deployer.address}
+    want.approve(vault, MaxUint256, {"from": deployer})
+    vault.deposit(want.balanceOf(deployer) // 4, {"from": deployer})
+
+    before = snap.snap(trackedUsers)
+    amount = want.balanceOf(deployer) // 2
+    vault.deposit(amount, {"from": deployer})
+    after = snap.snap(trackedUsers)
+
+    diff = snap.compare(before, after)
+    assert diff
+    assert diff.delta("balances.want.user") == -amount
+    assert diff.delta("balances.want.sett") == amount
+    assert diff.delta("sett.balance") == amount
+    assert diff.relative("sett.balance") == amount / before.get("sett.balance")
+    assert diff.delta("strategy.balanceOfPool") == 0
+
+    ## Only the metrics that moved, in column order
+    changed = diff.changed()
+    assert "balances.want.user" in changed and "sett.totalSupply" in changed
+    assert "strategy.balanceOfPool" not in changed
+    assert changed == sorted(changed, key=before.columns.ids.get)
+    assert [row[0] for row in diff.rows()] == changed
+    assert len(diff) == len(changed)
+
+
+def test_gather_snaps_matches_sync_snaps(deployer, vault, strategy, want):
+    want.approve(vault, MaxUint256, {"from": deployer})
+    vault.deposit(want.balanceOf(deployer) // 2, {"from": deployer})
+    managers = [
+        SnapshotManager(vault, strategy, "StrategySnapshot"),
+        SnapshotManager(vault, strategy, "StrategySnapshot"),
+    ]
+    managers[1].addEntity("user", deployer.address)
+
+    block = chain.height
+    gathered = asyncio.run(gather_snaps(managers, block=block))
+    for manager, snap in zip(managers, gathered):
+        expected = manager.snap(block=block)
+        assert snap.block == expected.block == block
+        assert snap.entityKeys == expected.entityKeys
+        assert snap.data == expected.data
+
+    ## Latest resolves to the same block for every manager
+    gathered = asyncio.run(gather_snaps(managers))
+    assert gathered[0].block == gathered[1].block == chain.height
+
+
+def test_snap_at_past_blocks(deployer, vault, strategy, want):
+    snap = SnapshotManager(vault, strategy, "StrategySnapshot")
+    trackedUsers = {"user": deployer.address}
+    want.approve(vault, MaxUint256, {"from": deployer})
+
+    blocks = []
+    for _ in range(2):
+        vault.deposit(want.balanceOf(deployer) // 2, {"from": deployer})
+        blocks.append(chain.height)
+    chain.mine(3)
+
+    past = snap.snap_at(blocks[0], trackedUsers)
+    assert past.block == blocks[0]
+    assert past.get("sett.balance") == vault.balance(block_identifier=blocks[0])
+    assert past.get("sett.totalSupply") == vault.totalSupply(block_identifier=blocks[0])
+    assert past.balances("want", "user") == want.balanceOf(
+        deployer, block_identifier=blocks[0]
+    )
+    assert past.balances("sett", "user") == vault.balanceOf(
+        deployer, block_identifier=blocks[0]
+    )
+
+    snaps = snap.snaps_at(blocks, trackedUsers)
+    assert [s.block for s in snaps] == blocks
+    assert snaps[0].data == past.data
+    assert snaps[1].get("sett.balance") > snaps[0].get("sett.balance")
+    assert snaps[1].get("sett.balance") == vault.balance(block_identifier=blocks[1])
+
+    ## On the dev node the aggregator reports the same block as chain.height
+    assert snap.snap(trackedUsers).block == chain.height
@@ -0,0 +1,83 @@
+import brownie
+from brownie import chain
+from helpers.constants import MaxUint256, WEEK, LOCK_DURATION
+from helpers.vault_simulator import VaultSimulator, TREASURY, STRATEGIST
+
+
+def assert_matches(sim, vault, strategy, want, deployer):
+    assert sim.ppfs() == vault.getPricePerFullShare()
+    assert sim.total_supply == vault.totalSupply()
+    assert sim.balance() == vault.balance()
+    assert sim.vault_want == want.balanceOf(vault)
+    assert sim.strategy_want == strategy.balanceOfWant()
+    assert sim.locked == strategy.balanceOfPool()
+    assert sim.shares.get("deployer", 0) == vault.balanceOf(deployer)
+    assert sim.shares.get(TREASURY, 0) == vault.balanceOf(vault.treasury())
+    assert sim.shares.get(STRATEGIST, 0) == vault.balanceOf(vault.strategist())
+
+
+def test_simulator_mirrors_vault(deployer, governance, vault, strategy, want, locker):
+    ## Non-zero fees so every fee share path is compared
+    vault.setPerformanceFeeStrategist(100, {"from": governance})
+    vault.setManagementFee(100, {"from": governance})
+    vault.setWithdrawalFee(10, {"from": governance})
+
+    sim = VaultSimulator(
+        performance_fee_governance=vault.performanceFeeGovernance(),
+        performance_fee_strategist=vault.performanceFeeStrategist(),
+        withdrawal_fee=vault.withdrawalFee(),
+        management_fee=vault.managementFee(),
+        to_earn_bps=vault.toEarnBps(),
+        start_time=vault.lastHarvestedAt(),
+    )
+
+    ## Deposit -> earn
+    depositAmount = want.balanceOf(deployer) // 2
+    want.approve(vault, MaxUint256, {"from": deployer})
+    tx = vault.deposit(depositAmount, {"from": deployer})
+    sim.time = tx.timestamp
+    sim.deposit("deployer", depositAmount)
+
+    tx = vault.earn({"from": governance})
+    sim.time = tx.timestamp
+    sim.earn()
+    assert_matches(sim, vault, strategy, want, deployer)
+    assert [list(lock) for lock in sim.locks] == [
+        [unlockTime, amount]
+        for amount, unlockTime in locker.lockedBalances(strategy)[3]
+    ]
+
+    ## Harvest, the simulator is fed the AURA the strategy reported
+    chain.sleep(WEEK)
+    chain.mine()
+    tx = strategy.harvest({"from": governance})
+    gain = tx.events["Harvested"]["amount"]
+    assert gain > 0
+    sim.time = tx.timestamp
+    fees = sim.harvest(gain)
+    assert fees.shares_perf_treasury + fees.shares_perf_strategist > 0
+    assert_matches(sim, vault, strategy, want, deployer)
+
+    ## Withdrawing from the idle want only
+    shares = want.balanceOf(vault) * vault.totalSupply() // vault.balance() // 2
+    before = want.balanceOf(deployer)
+    tx = vault.withdraw(shares, {"from": deployer})
+    sim.time = tx.timestamp
+    assert sim.withdraw("deployer", shares) == want.balanceOf(deployer) - before
+    assert_matches(sim, vault, strategy, want, deployer)
+
+    ## Both fail the Withdrawal Safety Check while the locks haven't expired
+    shares = vault.balanceOf(deployer)
+    with brownie.reverts():
+        vault.withdraw(shares, {"from": deployer})
+    sim.time = chain.time()
+    assert sim.withdraw("deployer", shares) is None
+
+    ## Once the locks expire, both release them and pay the same
+    chain.sleep(LOCK_DURATION + WEEK)
+    chain.mine()
+    before = want.balanceOf(deployer)
+    tx = vault.withdraw(shares, {"from": deployer})
+    sim.time = tx.timestamp
+    assert sim.withdraw("deployer", shares) == want.balanceOf(deployer) - before
+    assert_matches(sim, vault, strategy, want, deployer)
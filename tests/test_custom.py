@@ -2,6 +2,7 @@ import brownie
 from brownie import interface, chain, accounts
 from helpers.constants import MaxUint256, AddressZero
 from helpers.SnapshotManager import SnapshotManager
+from helpers.harvest_quoter import HarvestQuoter
 from helpers.time import days
 
 """
@@ -226,6 +227,44 @@ def test_sweep_rewards_with_redirection(strategy, strategist, governance, bribes
     assert bbausd.balanceOf(strategist) == balance_recepient_before + amount
 
 
+def test_cant_sweep_protected_in_batch(strategy, strategist, bribes_processor):
+    weth = interface.IWeth(strategy.WETH())
+    auraBal = strategy.AURABAL()
+
+    # The whole batch reverts if any token is protected
+    with brownie.reverts("_onlyNotProtectedTokens"):
+        strategy.sweepRewards([weth, auraBal], {"from": strategist})
+
+
+def test_sweep_rewards_batch_with_redirection_fees(
+    strategy, strategist, governance, vault, bribes_processor
+):
+    # Transfer exra reward tokens to the strategy
+    amount = 1000e18
+    bbausd = interface.IERC20Detailed(BB_A_USD)
+    whale = accounts.at(BB_A_USD_WHALE, force=True)
+    bbausd.transfer(strategy, amount, {"from": whale})
+
+    weth = interface.IWeth(strategy.WETH())
+    weth.deposit({"from": strategist, "value": 1e18})
+    interface.IERC20Detailed(weth).transfer(strategy, 1e18, {"from": strategist})
+
+    # Both tokens pay a fee to the treasury, which is only read once
+    strategy.setRedirectionToken(bbausd, strategist, 1000, {"from": governance})
+    strategy.setRedirectionToken(weth, strategist, 1000, {"from": governance})
+
+    treasury = vault.treasury()
+    tx = strategy.sweepRewards([bbausd, weth], {"from": strategist})
+
+    event = tx.events["RedirectionFee"]
+    assert len(event) == 2
+    assert event[0]["destination"] == treasury
+    assert event[0]["amount"] == amount * 1000 // 10000
+    assert event[1]["destination"] == treasury
+    assert event[1]["amount"] == 1e18 * 1000 // 10000
+    assert bbausd.balanceOf(strategy) == 0
+
+
 def test_cant_take_eth(deployer, strategy):
     with brownie.reverts("onlyWhileClaiming"):
         accounts.at(deployer).transfer(strategy, "1 ether")
@@ -235,6 +274,29 @@ def test_can_set_slippage(strategy, strategist):
     strategy.setAuraBalToBalEthBptMinOutBps(10, {"from": strategist})
     assert strategy.auraBalToBalEthBptMinOutBps() == 10
 
+
+def test_harvest_quoter_sets_min_out(setup_strat, strategist, governance):
+    chain.sleep(days(7))
+    chain.mine()
+
+    quoter = HarvestQuoter(setup_strat)
+    quote = quoter.quote()
+    assert quote.auraBal > 0
+    assert quote.bpt > 0 and quote.weth > 0 and quote.aura > 0
+    assert 0 < quote.minOutBps <= 10_000
+
+    ## Same block, served from the cache
+    assert quoter.quote() is quote
+
+    quoter.push(strategist)
+    assert setup_strat.auraBalToBalEthBptMinOutBps() == quote.minOutBps
+
+    ## The pushed minOut doesn't block the harvest, which gets about the quoted AURA
+    tx = setup_strat.harvest({"from": governance})
+    harvested = tx.events["Harvested"]["amount"]
+    assert harvested >= quote.aura * (10_000 - quoter.slippage_bps) // 10_000
+
+
 def test_snapshot_delegation(delegation_registry, strategy, governance, strategist):
     target_delegate = "0x14F83fF95D4Ec5E8812DDf42DA1232b0ba1015e6"
     CONVEX_SPACE_ID = "0x6376782e65746800000000000000000000000000000000000000000000000000"
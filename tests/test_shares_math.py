@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from helpers.shares_math import (
+    from_want_to_shares,
+    from_shares_to_want,
+    get_withdrawal_fees_in_shares,
+    get_report_fees,
+    batch_from_want_to_shares,
+    batch_from_shares_to_want,
+    batch_get_withdrawal_fees_in_shares,
+    batch_get_report_fees,
+)
+
+ROWS = 200
+rng = random.Random(0)
+
+
+def amounts(low=10**15, high=10**27):
+    return [rng.randint(low, high) for _ in range(ROWS)]
+
+
+def test_batch_matches_scalar():
+    want = amounts()
+    supply = amounts()
+    balance = amounts()
+    ppfs = amounts(10**17, 10**19)
+    fees = [rng.randint(0, 200) for _ in range(ROWS)]
+
+    assert batch_from_want_to_shares(want, supply, balance) == [
+        from_want_to_shares(*row) for row in zip(want, supply, balance)
+    ]
+    assert batch_from_shares_to_want(want, ppfs, 18) == [
+        from_shares_to_want(shares, price, 18) for shares, price in zip(want, ppfs)
+    ]
+    assert batch_get_withdrawal_fees_in_shares(
+        want, ppfs, 18, fees, supply, balance
+    ) == [
+        get_withdrawal_fees_in_shares(shares, price, 18, fee, total, pool)
+        for shares, price, fee, total, pool in zip(want, ppfs, fees, supply, balance)
+    ]
+
+
+def test_batch_report_fees_matches_scalar():
+    gain = amounts()
+    supply = amounts()
+    balance = amounts()
+    elapsed = [rng.randint(0, 60 * 60 * 24 * 365) for _ in range(ROWS)]
+
+    batch = batch_get_report_fees(gain, 300, 100, 200, elapsed, supply, balance)
+    for i in range(ROWS):
+        fees = get_report_fees(
+            gain[i], 300, 100, 200, elapsed[i], supply[i], balance[i]
+        )
+        assert batch.shares_perf_treasury[i] == fees.shares_perf_treasury
+        assert batch.shares_management[i] == fees.shares_management
+        assert batch.shares_perf_strategist[i] == fees.shares_perf_strategist
+
+
+def test_batch_broadcasts_scalars():
+    ## Only scalars, a batch of one
+    assert batch_from_want_to_shares(10**18, 2 * 10**18, 4 * 10**18) == [
+        from_want_to_shares(10**18, 2 * 10**18, 4 * 10**18)
+    ]
+    fees = batch_get_report_fees(10**18, 300, 0, 0, 0, 10**21, 10**21)
+    assert fees.shares_perf_treasury == [
+        get_report_fees(10**18, 300, 0, 0, 0, 10**21, 10**21).shares_perf_treasury
+    ]
+
+    ## Scalars next to a sequence are repeated for every row
+    want = amounts()
+    assert batch_from_want_to_shares(want, 10**21, 10**22) == [
+        from_want_to_shares(amount, 10**21, 10**22) for amount in want
+    ]
+
+
+def test_batch_rejects_length_mismatch():
+    with pytest.raises(AssertionError):
+        batch_from_want_to_shares([1, 2, 3], [1, 2], 10)
+    with pytest.raises(AssertionError):
+        batch_get_report_fees([1, 2], 300, 0, 0, 0, [10, 20, 30], 10)